@@ -0,0 +1,246 @@
+"""
+Benchmarks the entailment backends of the logic module.
+
+Usage: python benchmark.py [--output report.json] [--baseline old.json]
+
+Every workload is a knowledge base with a list of queries. Each backend
+answers all queries of a workload, and its time and peak memory are
+recorded in a JSON report. Given a baseline report, any backend that got
+slower than the tolerance allows is listed and the exit status is 1.
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from logic import *
+
+# Backends that enumerate every assignment are skipped above this size
+MAX_ENUMERATED_SYMBOLS = 20
+
+
+def knights(n):
+    """
+    n people are each a knight or a knave. Each person says the next one
+    is a knave, and the last says the first is a knight.
+    """
+    knight = [Symbol(f"{i} is a Knight") for i in range(n)]
+    knave = [Symbol(f"{i} is a Knave") for i in range(n)]
+    knowledge = And()
+    for i in range(n):
+        knowledge.add(Or(knight[i], knave[i]))
+        knowledge.add(Not(And(knight[i], knave[i])))
+        claim = knave[i + 1] if i + 1 < n else knight[0]
+        knowledge.add(Biconditional(knight[i], claim))
+    return knowledge, knight + knave
+
+
+def mastermind(n):
+    """
+    n colors in n positions, each used once. One guess has exactly two
+    colors in place, and a second guess has none.
+    """
+    colors = [f"color{c}" for c in range(n)]
+    symbol = {(color, i): Symbol(f"{color}{i}")
+              for color in colors for i in range(n)}
+    knowledge = And()
+
+    # Each color has exactly one position, and each position one color
+    for color in colors:
+        knowledge.add(Or(*[symbol[color, i] for i in range(n)]))
+        for i, j in itertools.combinations(range(n), 2):
+            knowledge.add(Not(And(symbol[color, i], symbol[color, j])))
+    for i in range(n):
+        for c1, c2 in itertools.combinations(colors, 2):
+            knowledge.add(Not(And(symbol[c1, i], symbol[c2, i])))
+
+    # First guess puts color i at position i, two of which are right
+    guess = [symbol[colors[i], i] for i in range(n)]
+    knowledge.add(Or(*[
+        And(*[guess[i] if i in right else Not(guess[i]) for i in range(n)])
+        for right in itertools.combinations(range(n), 2)
+    ]))
+
+    # Second guess shifts every color one position along, none are right
+    knowledge.add(And(*[Not(symbol[colors[i], (i + 1) % n])
+                        for i in range(n)]))
+    return knowledge, list(symbol.values())
+
+
+def queens(n):
+    """n queens on an n by n board, none attacking another."""
+    queen = [[Symbol(f"q{i}_{j}") for j in range(n)] for i in range(n)]
+    knowledge = And()
+    for i in range(n):
+        knowledge.add(Or(*queen[i]))
+    cells = list(itertools.product(range(n), repeat=2))
+    for (i, j), (k, l) in itertools.combinations(cells, 2):
+        if i == k or j == l or abs(i - k) == abs(j - l):
+            knowledge.add(Not(And(queen[i][j], queen[k][l])))
+    return knowledge, [queen[0][j] for j in range(n)]
+
+
+def pigeonhole(n):
+    """n + 1 pigeons in n holes, one pigeon per hole. Unsatisfiable."""
+    pigeon = [[Symbol(f"p{i}_{h}") for h in range(n)] for i in range(n + 1)]
+    knowledge = And()
+    for i in range(n + 1):
+        knowledge.add(Or(*pigeon[i]))
+    for h in range(n):
+        for i, j in itertools.combinations(range(n + 1), 2):
+            knowledge.add(Or(Not(pigeon[i][h]), Not(pigeon[j][h])))
+    return knowledge, [pigeon[0][0]]
+
+
+def random_3sat(n, ratio=4.26, seed=0):
+    """Random 3-SAT with n symbols, near the satisfiability threshold."""
+    generator = random.Random(seed)
+    symbols = [Symbol(f"x{i}") for i in range(n)]
+    knowledge = And()
+    for _ in range(round(n * ratio)):
+        knowledge.add(Or(*[
+            symbol if generator.random() < 0.5 else Not(symbol)
+            for symbol in generator.sample(symbols, 3)
+        ]))
+    return knowledge, symbols[:4]
+
+
+WORKLOADS = {
+    "knights": (knights, [4, 8, 40]),
+    "mastermind": (mastermind, [4, 5, 6]),
+    "queens": (queens, [4, 5, 8]),
+    "pigeonhole": (pigeonhole, [3, 4, 6]),
+    "random_3sat": (random_3sat, [12, 18, 60]),
+}
+
+
+def brute_force(knowledge, queries):
+    return [model_check(knowledge, query) for query in queries]
+
+
+def compiled(knowledge, queries):
+    return [not count_models(And(knowledge, Not(query))) for query in queries]
+
+
+def bit_parallel(knowledge, queries):
+    return [model_check_bitwise(knowledge, query) for query in queries]
+
+
+def sat(knowledge, queries):
+    kb = KnowledgeBase(knowledge)
+    return [kb.ask(query) for query in queries]
+
+
+BACKENDS = {
+    "brute_force": (brute_force, True),
+    "compiled": (compiled, False),
+    "bit_parallel": (bit_parallel, True),
+    "sat": (sat, False),
+}
+
+
+def measure(backend, knowledge, queries, repeat):
+    """Returns answers, best time in seconds and peak bytes allocated."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        answers = backend(knowledge, queries)
+        times.append(time.perf_counter() - start)
+
+    # Memory is measured separately, since tracing slows everything down
+    tracemalloc.start()
+    backend(knowledge, queries)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return answers, min(times), peak
+
+
+def run(families, backends, repeat):
+    results = []
+    for family in families:
+        build, sizes = WORKLOADS[family]
+        for size in sizes:
+            knowledge, queries = build(size)
+            symbols = len(knowledge.symbols())
+            answers = dict()
+            for name in backends:
+                backend, enumerates = BACKENDS[name]
+                result = {"family": family, "size": size, "symbols": symbols,
+                          "backend": name}
+                if enumerates and symbols > MAX_ENUMERATED_SYMBOLS:
+                    result["skipped"] = True
+                else:
+                    answers[name], seconds, peak = measure(
+                        backend, knowledge, queries, repeat
+                    )
+                    result.update(seconds=seconds, peak_bytes=peak)
+                    print(f"{family:>12} {size:>3} {name:>12} "
+                          f"{seconds:10.4f}s {peak / 1024:10.1f} KiB",
+                          file=sys.stderr)
+                results.append(result)
+
+            # Every backend that ran must agree
+            if len({tuple(a) for a in answers.values()}) > 1:
+                for result in results[-len(backends):]:
+                    result["mismatch"] = True
+    return results
+
+
+def regressions(results, baseline, tolerance):
+    """Returns results slower than in baseline by more than tolerance."""
+    previous = {(r["family"], r["size"], r["backend"]): r
+                for r in baseline["results"] if "seconds" in r}
+    slower = []
+    for result in results:
+        old = previous.get((result["family"], result["size"],
+                            result["backend"]))
+        if old and "seconds" in result and (
+            result["seconds"] > old["seconds"] * (1 + tolerance)
+        ):
+            slower.append({**result, "baseline_seconds": old["seconds"]})
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--families", nargs="+", choices=WORKLOADS,
+                        default=list(WORKLOADS))
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS,
+                        default=list(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the report to this file")
+    parser.add_argument("--baseline", help="report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown relative to the baseline")
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": run(args.families, args.backends, args.repeat),
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = regressions(
+                report["results"], json.load(f), args.tolerance
+            )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    mismatches = any(r.get("mismatch") for r in report["results"])
+    if mismatches or report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -22,31 +22,31 @@ symbols = characters + rooms + weapons
 
 def check_knowledge(knowledge):
     for symbol in symbols:
-        if model_check(knowledge, symbol):
+        if knowledge.ask(symbol):
             termcolor.cprint(f"{symbol}: YES", "green")
-        elif not model_check(knowledge, Not(symbol)):
+        elif not knowledge.ask(Not(symbol)):
             print(f"{symbol}: MAYBE")
 
 
 # There must be a person, room, and weapon.
-knowledge = And(
+knowledge = KnowledgeBase(And(
     Or(mustard, plum, scarlet),
     Or(ballroom, kitchen, library),
     Or(knife, revolver, wrench)
-)
+))
 
 # Initial cards
-knowledge.add(And(
+knowledge.tell(And(
     Not(mustard), Not(kitchen), Not(revolver)
 ))
 
 # Unknown card
-knowledge.add(Or(
+knowledge.tell(Or(
     Not(scarlet), Not(library), Not(wrench)
 ))
 
 # Known cards
-knowledge.add(Not(plum))
-knowledge.add(Not(ballroom))
+knowledge.tell(Not(plum))
+knowledge.tell(Not(ballroom))
 
 check_knowledge(knowledge)
@@ -1,7 +1,37 @@
+import heapq
 import itertools
+import multiprocessing
+import os
+import re
+import weakref
+
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Shared instances of immutable sentences, keyed by type and operands
+_interned = weakref.WeakValueDictionary()
+
+# Fewest symbols left to enumerate for which model_check uses processes
+PARALLEL_SYMBOLS = 16
+
+
+class EvaluationException(Exception):
+    pass
 
 
 class Sentence():
+    """
+    Base class for logical sentences.
+
+    Symbol, Not, Implication, Biconditional and the cardinality
+    sentences are immutable and hash-consed: constructing one from shared
+    operands returns the shared instance for those operands, so equality
+    is an identity check and hashes are computed once. And and Or can
+    still grow with `add`, so they are not shared, and neither is any
+    sentence built on one; those compare and hash by structure.
+    """
+
+    __slots__ = ("__weakref__",)
 
     def evaluate(self, model):
         """Evaluates the logical sentence."""
@@ -15,6 +45,49 @@ class Sentence():
         """Returns a set of all symbols in the logical sentence."""
         return set()
 
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(self) is not type(other) or self.shared():
+            return False
+        return self.structure() == other.structure()
+
+    def __hash__(self):
+        if self._hash is not None:
+            return self._hash
+        return hash((type(self).__name__, self.structure()))
+
+    def structure(self):
+        """Returns the fields that define the sentence, for comparison."""
+        return ()
+
+    def shared(self):
+        """Returns True if the sentence is a hash-consed instance."""
+        return getattr(self, "_hash", None) is not None
+
+    @classmethod
+    def intern(cls, key, children, **fields):
+        """
+        Returns the shared sentence of this type for key and its child
+        sentences if every child is shared, or else a new unshared one.
+        """
+        if not all(child.shared() for child in children):
+            sentence = object.__new__(cls)
+            for field, value in fields.items():
+                setattr(sentence, field, value)
+            sentence._hash = None
+            return sentence
+
+        key = key + tuple(map(id, children))
+        sentence = _interned.get((cls, key))
+        if sentence is None:
+            sentence = object.__new__(cls)
+            for field, value in fields.items():
+                setattr(sentence, field, value)
+            sentence._hash = hash(key)
+            _interned[(cls, key)] = sentence
+        return sentence
+
     @classmethod
     def validate(cls, sentence):
         if not isinstance(sentence, Sentence):
@@ -44,14 +117,13 @@ class Sentence():
 
 class Symbol(Sentence):
 
-    def __init__(self, name):
-        self.name = name
+    __slots__ = ("name", "_hash")
 
-    def __eq__(self, other):
-        return isinstance(other, Symbol) and self.name == other.name
+    def __new__(cls, name):
+        return cls.intern(("symbol", name), (), name=name)
 
-    def __hash__(self):
-        return hash(("symbol", self.name))
+    def __reduce__(self):
+        return (type(self), (self.name,))
 
     def __repr__(self):
         return self.name
@@ -70,15 +142,18 @@ class Symbol(Sentence):
 
 
 class Not(Sentence):
-    def __init__(self, operand):
+
+    __slots__ = ("operand", "_hash")
+
+    def __new__(cls, operand):
         Sentence.validate(operand)
-        self.operand = operand
+        return cls.intern(("not",), (operand,), operand=operand)
 
-    def __eq__(self, other):
-        return isinstance(other, Not) and self.operand == other.operand
+    def __reduce__(self):
+        return (type(self), (self.operand,))
 
-    def __hash__(self):
-        return hash(("not", hash(self.operand)))
+    def structure(self):
+        return (self.operand,)
 
     def __repr__(self):
         return f"Not({self.operand})"
@@ -94,13 +169,18 @@ class Not(Sentence):
 
 
 class And(Sentence):
+
+    __slots__ = ("conjuncts",)
+
     def __init__(self, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
         self.conjuncts = list(conjuncts)
 
     def __eq__(self, other):
-        return isinstance(other, And) and self.conjuncts == other.conjuncts
+        return self is other or (
+            isinstance(other, And) and self.conjuncts == other.conjuncts
+        )
 
     def __hash__(self):
         return hash(
@@ -127,17 +207,22 @@ class And(Sentence):
                            for conjunct in self.conjuncts])
 
     def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
+        return set().union(*[conjunct.symbols() for conjunct in self.conjuncts])
 
 
 class Or(Sentence):
+
+    __slots__ = ("disjuncts",)
+
     def __init__(self, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
         self.disjuncts = list(disjuncts)
 
     def __eq__(self, other):
-        return isinstance(other, Or) and self.disjuncts == other.disjuncts
+        return self is other or (
+            isinstance(other, Or) and self.disjuncts == other.disjuncts
+        )
 
     def __hash__(self):
         return hash(
@@ -158,23 +243,24 @@ class Or(Sentence):
                             for disjunct in self.disjuncts])
 
     def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
+        return set().union(*[disjunct.symbols() for disjunct in self.disjuncts])
 
 
 class Implication(Sentence):
-    def __init__(self, antecedent, consequent):
+
+    __slots__ = ("antecedent", "consequent", "_hash")
+
+    def __new__(cls, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
-        self.antecedent = antecedent
-        self.consequent = consequent
+        return cls.intern(("implies",), (antecedent, consequent),
+                          antecedent=antecedent, consequent=consequent)
 
-    def __eq__(self, other):
-        return (isinstance(other, Implication)
-                and self.antecedent == other.antecedent
-                and self.consequent == other.consequent)
+    def __reduce__(self):
+        return (type(self), (self.antecedent, self.consequent))
 
-    def __hash__(self):
-        return hash(("implies", hash(self.antecedent), hash(self.consequent)))
+    def structure(self):
+        return (self.antecedent, self.consequent)
 
     def __repr__(self):
         return f"Implication({self.antecedent}, {self.consequent})"
@@ -193,19 +279,20 @@ class Implication(Sentence):
 
 
 class Biconditional(Sentence):
-    def __init__(self, left, right):
+
+    __slots__ = ("left", "right", "_hash")
+
+    def __new__(cls, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
-        self.left = left
-        self.right = right
+        return cls.intern(("biconditional",), (left, right),
+                          left=left, right=right)
 
-    def __eq__(self, other):
-        return (isinstance(other, Biconditional)
-                and self.left == other.left
-                and self.right == other.right)
+    def __reduce__(self):
+        return (type(self), (self.left, self.right))
 
-    def __hash__(self):
-        return hash(("biconditional", hash(self.left), hash(self.right)))
+    def structure(self):
+        return (self.left, self.right)
 
     def __repr__(self):
         return f"Biconditional({self.left}, {self.right})"
@@ -217,47 +304,1401 @@ class Biconditional(Sentence):
                     and not self.right.evaluate(model)))
 
     def formula(self):
-        left = Sentence.parenthesize(str(self.left))
-        right = Sentence.parenthesize(str(self.right))
+        left = Sentence.parenthesize(self.left.formula())
+        right = Sentence.parenthesize(self.right.formula())
         return f"{left} <=> {right}"
 
     def symbols(self):
         return set.union(self.left.symbols(), self.right.symbols())
 
 
-def model_check(knowledge, query):
-    """Checks if knowledge base entails query."""
+class Cardinality(Sentence):
+    """
+    Sentence that is true when the number of true operands is between
+    low and high, inclusive. Evaluates in time linear in the operands.
+    """
 
-    def check_all(knowledge, query, symbols, model):
-        """Checks if knowledge base entails query, given a particular model."""
+    __slots__ = ("operands", "low", "high", "_hash")
 
-        # If model has an assignment for each symbol
-        if not symbols:
+    @classmethod
+    def bounded(cls, low, high, operands):
+        for operand in operands:
+            Sentence.validate(operand)
+        low = max(low, 0)
+        return cls.intern((cls.__name__, low, high), operands,
+                          operands=tuple(operands), low=low, high=high)
 
-            # If knowledge base is true in model, then query must also be true
-            if knowledge.evaluate(model):
-                return query.evaluate(model)
-            return True
-        else:
+    def parameters(self):
+        """Returns the arguments this sentence was constructed with."""
+        return self.operands
 
-            # Choose one of the remaining unused symbols
-            remaining = symbols.copy()
-            p = remaining.pop()
+    def __reduce__(self):
+        return (type(self), self.parameters())
 
-            # Create a model where the symbol is true
-            model_true = model.copy()
-            model_true[p] = True
+    def structure(self):
+        return (self.low, self.high, self.operands)
 
-            # Create a model where the symbol is false
-            model_false = model.copy()
-            model_false[p] = False
+    def __repr__(self):
+        parameters = ", ".join(str(parameter)
+                               for parameter in self.parameters())
+        return f"{type(self).__name__}({parameters})"
 
-            # Ensure entailment holds in both models
-            return (check_all(knowledge, query, remaining, model_true) and
-                    check_all(knowledge, query, remaining, model_false))
+    def evaluate(self, model):
+        count = sum(operand.evaluate(model) for operand in self.operands)
+        return self.low <= count <= self.high
 
-    # Get all symbols in both knowledge and query
-    symbols = set.union(knowledge.symbols(), query.symbols())
+    def formula(self):
+        parameters = ", ".join(
+            parameter.formula() if isinstance(parameter, Sentence)
+            else str(parameter)
+            for parameter in self.parameters()
+        )
+        return f"{type(self).__name__}({parameters})"
+
+    def symbols(self):
+        return set().union(*[operand.symbols() for operand in self.operands])
+
+
+class ExactlyOne(Cardinality):
+
+    __slots__ = ()
+
+    def __new__(cls, *operands):
+        return cls.bounded(1, 1, operands)
+
+
+class AtMostK(Cardinality):
+
+    __slots__ = ()
+
+    def __new__(cls, k, *operands):
+        return cls.bounded(0, k, operands)
+
+    @property
+    def k(self):
+        return self.high
+
+    def parameters(self):
+        return (self.high,) + self.operands
+
+
+class AtLeastK(Cardinality):
+
+    __slots__ = ()
+
+    def __new__(cls, k, *operands):
+        return cls.bounded(k, len(operands), operands)
+
+    @property
+    def k(self):
+        return self.low
+
+    def parameters(self):
+        return (self.low,) + self.operands
+
+
+def simplify(sentence):
+    """
+    Returns an equivalent sentence with redundant structure removed.
 
-    # Check that knowledge entails query
-    return check_all(knowledge, query, symbols, dict())
+    Nested conjunctions and disjunctions are flattened and deduplicated,
+    literals are propagated into their sibling operands, and constant
+    subexpressions are folded away. A sentence that is always true
+    simplifies to And() and one that is always false to Or().
+    """
+    result = _simplify(sentence, dict())
+    if result is True:
+        return And()
+    if result is False:
+        return Or()
+    return result
+
+
+def _unit(sentence):
+    """Returns (name, value) if sentence is a literal, otherwise None."""
+    if isinstance(sentence, Symbol):
+        return sentence.name, True
+    if isinstance(sentence, Not) and isinstance(sentence.operand, Symbol):
+        return sentence.operand.name, False
+    return None
+
+
+def _negate(sentence):
+    if isinstance(sentence, bool):
+        return not sentence
+    if isinstance(sentence, Not):
+        return sentence.operand
+    return Not(sentence)
+
+
+def _simplify(sentence, facts):
+    """Simplifies sentence given facts, returning a sentence or a bool."""
+    if isinstance(sentence, Symbol):
+        return facts.get(sentence.name, sentence)
+
+    if isinstance(sentence, Not):
+        return _negate(_simplify(sentence.operand, facts))
+
+    if isinstance(sentence, And):
+        return _simplify_operands(sentence.conjuncts, facts, And)
+
+    if isinstance(sentence, Or):
+        return _simplify_operands(sentence.disjuncts, facts, Or)
+
+    if isinstance(sentence, Implication):
+        antecedent = _simplify(sentence.antecedent, facts)
+        if antecedent is False:
+            return True
+        unit = _unit(antecedent)
+        if unit is not None:
+            facts = {**facts, unit[0]: unit[1]}
+        consequent = _simplify(sentence.consequent, facts)
+        if consequent is True or antecedent == consequent:
+            return True
+        if antecedent is True:
+            return consequent
+        if consequent is False:
+            return _negate(antecedent)
+        return Implication(antecedent, consequent)
+
+    if isinstance(sentence, Biconditional):
+        left = _simplify(sentence.left, facts)
+        right = _simplify(sentence.right, facts)
+        for constant, other in ((left, right), (right, left)):
+            if isinstance(constant, bool):
+                return other if constant else _negate(other)
+        if left == right:
+            return True
+        if left == _negate(right):
+            return False
+        return Biconditional(left, right)
+
+    if isinstance(sentence, Cardinality):
+        return _simplify_cardinality(sentence, facts)
+
+    raise TypeError(f"cannot simplify {type(sentence).__name__}")
+
+
+def _simplify_cardinality(sentence, facts):
+    """Drops constant operands and rewrites trivial bounds."""
+    low, high = sentence.low, sentence.high
+    operands = []
+    for operand in sentence.operands:
+        result = _simplify(operand, facts)
+        if result is True:
+            low -= 1
+            high -= 1
+        elif result is not False:
+            operands.append(result)
+
+    n = len(operands)
+    low, high = max(low, 0), min(high, n)
+    if low > high:
+        return False
+    if low == 0 and high == n:
+        return True
+    if high == 0:
+        return _simplify(And(*[_negate(operand) for operand in operands]),
+                         facts)
+    if low == n:
+        return _simplify(And(*operands), facts)
+    if low == 1 and high == n:
+        return _simplify(Or(*operands), facts)
+    if low == 0 and high == n - 1:
+        return _simplify(Or(*[_negate(operand) for operand in operands]),
+                         facts)
+    if low == high == 1:
+        return ExactlyOne(*operands)
+    if low == 0:
+        return AtMostK(high, *operands)
+    if high == n:
+        return AtLeastK(low, *operands)
+    return And(AtLeastK(low, *operands), AtMostK(high, *operands))
+
+
+def _simplify_operands(operands, facts, kind):
+    """
+    Simplifies the operands of a conjunction or disjunction.
+
+    Each literal operand is assumed true (conjunction) or false
+    (disjunction) while simplifying its siblings, repeating until no new
+    literals turn up.
+    """
+    absorbing = kind is Or
+    local = dict(facts)
+    literals = dict()
+    pending = operands
+    while True:
+        parts = []
+        learned = False
+        for operand in pending:
+            result = _simplify(operand, local)
+            if result is absorbing:
+                return absorbing
+            if result is (not absorbing):
+                continue
+
+            # Flatten nested operands of the same kind
+            if isinstance(result, kind):
+                nested = (result.conjuncts if kind is And
+                          else result.disjuncts)
+            else:
+                nested = [result]
+
+            for part in nested:
+                unit = _unit(part)
+                if unit is None:
+                    parts.append(part)
+                    continue
+                name, value = unit
+                if absorbing:
+                    value = not value
+                if local.get(name, value) != value:
+                    return absorbing
+                if name not in local:
+                    local[name] = value
+                    literals[name] = part
+                    learned = True
+        pending = parts
+        if not learned:
+            break
+
+    operands = list(literals.values()) + list(dict.fromkeys(pending))
+    if not operands:
+        return not absorbing
+    if len(operands) == 1:
+        return operands[0]
+    return kind(*operands)
+
+
+class Circuit():
+    """
+    Sentences compiled to a circuit of gates over symbols.
+
+    Every gate counts how many of its inputs are true, so flipping a
+    symbol updates only the gates that depend on it, and stops as soon as
+    a gate's value does not change. Negation is folded into the edges.
+    """
+
+    def __init__(self, sentences, model=None):
+        model = model or dict()
+        self.variables = dict()     # symbol name -> node
+        self.kinds = []             # node -> None for symbols, gate kind,
+                                    # or (low, high) for cardinality gates
+        self.arity = []
+        self.counts = []
+        self.values = []
+        self.parents = []           # node -> list of (parent, negated)
+        self.compiled = dict()
+        self.roots = [self._compile(sentence, model)
+                      for sentence in sentences]
+        del self.compiled
+
+    def _node(self, kind, value, inputs):
+        node = len(self.values)
+        self.kinds.append(kind)
+        self.arity.append(len(inputs))
+        self.parents.append([])
+        count = 0
+        for child, negated in inputs:
+            self.parents[child].append((node, negated))
+            count += self.values[child] != negated
+        self.counts.append(count)
+        self.values.append(value if kind is None
+                           else self._test(kind, count, len(inputs)))
+        return node
+
+    def _compile(self, sentence, model):
+        """Returns (node, negated) computing sentence."""
+        if isinstance(sentence, Not):
+            node, negated = self._compile(sentence.operand, model)
+            return node, not negated
+        if id(sentence) in self.compiled:
+            return self.compiled[id(sentence)], False
+
+        if isinstance(sentence, Symbol):
+            if sentence.name not in self.variables:
+                self.variables[sentence.name] = self._node(
+                    None, bool(model.get(sentence.name, False)), []
+                )
+            node = self.variables[sentence.name]
+        elif isinstance(sentence, And):
+            node = self._node("and", None, [self._compile(conjunct, model)
+                                            for conjunct in sentence.conjuncts])
+        elif isinstance(sentence, Or):
+            node = self._node("or", None, [self._compile(disjunct, model)
+                                           for disjunct in sentence.disjuncts])
+        elif isinstance(sentence, Implication):
+            antecedent, negated = self._compile(sentence.antecedent, model)
+            node = self._node("or", None, [
+                (antecedent, not negated),
+                self._compile(sentence.consequent, model)
+            ])
+        elif isinstance(sentence, Biconditional):
+            node = self._node("iff", None, [self._compile(sentence.left, model),
+                                            self._compile(sentence.right, model)])
+        elif isinstance(sentence, Cardinality):
+            node = self._node((sentence.low, sentence.high), None,
+                              [self._compile(operand, model)
+                               for operand in sentence.operands])
+        else:
+            raise TypeError(f"cannot compile {type(sentence).__name__}")
+
+        self.compiled[id(sentence)] = node
+        return node, False
+
+    @staticmethod
+    def _test(kind, count, arity):
+        """Returns the value of a gate with count true inputs."""
+        if kind == "and":
+            return count == arity
+        if kind == "or":
+            return count > 0
+        if kind == "iff":
+            return count != 1
+        low, high = kind
+        return low <= count <= high
+
+    def value(self, index):
+        """Returns the current value of the index-th compiled sentence."""
+        node, negated = self.roots[index]
+        return self.values[node] != negated
+
+    def flip(self, name):
+        """Negates a symbol and updates the gates that depend on it."""
+        kinds, arity = self.kinds, self.arity
+        counts, values, parents = self.counts, self.values, self.parents
+        node = self.variables[name]
+        values[node] = not values[node]
+
+        # Each change carries the value it changed to, since a gate may
+        # change again before its earlier change reaches its parents
+        changes = [(node, values[node])]
+        while changes:
+            node, value = changes.pop()
+            for parent, negated in parents[node]:
+                if value != negated:
+                    count = counts[parent] = counts[parent] + 1
+                else:
+                    count = counts[parent] = counts[parent] - 1
+
+                # Same as _test, inlined since this is the innermost loop
+                kind = kinds[parent]
+                if kind == "and":
+                    updated = count == arity[parent]
+                elif kind == "or":
+                    updated = count > 0
+                elif kind == "iff":
+                    updated = count != 1
+                else:
+                    updated = kind[0] <= count <= kind[1]
+                if updated != values[parent]:
+                    values[parent] = updated
+                    changes.append((parent, updated))
+
+    def walk(self, names):
+        """
+        Visits every assignment of names, which must start out false, in
+        Gray-code order so that one symbol flips per step. Yields the
+        bitmask of names currently true after each step.
+        """
+        mask = 0
+        yield mask
+        for step in range(1, 1 << len(names)):
+            bit = (step & -step).bit_length() - 1
+            mask ^= 1 << bit
+            self.flip(names[bit])
+            yield mask
+
+
+def model_check(knowledge, query, processes=1):
+    """
+    Checks if knowledge base entails query.
+
+    With more than one process (or None, for one per CPU), the first few
+    symbols are fixed every possible way and each of the resulting
+    subproblems is checked in a process pool. All workers stop as soon as
+    any of them finds a model where the query is false.
+    """
+
+    # Simplify knowledge and fix its known literals instead of enumerating them
+    knowledge = simplify(knowledge)
+    model = dict()
+    conjuncts = (knowledge.conjuncts if isinstance(knowledge, And)
+                 else [knowledge])
+    for conjunct in conjuncts:
+        unit = _unit(conjunct)
+        if unit is not None:
+            model[unit[0]] = unit[1]
+
+    # Get all remaining symbols in both knowledge and query
+    symbols = sorted(
+        set.union(knowledge.symbols(), query.symbols()) - model.keys()
+    )
+
+    if processes == 1 or len(symbols) < PARALLEL_SYMBOLS:
+        return _check_all(knowledge, query, model, symbols)
+    return _check_parallel(knowledge, query, model, symbols,
+                           processes or os.cpu_count())
+
+
+def model_check_queries(knowledge, queries, processes=None):
+    """
+    Checks if knowledge base entails each of queries, checking the
+    queries in parallel, and returns a list of the results.
+    """
+    with ProcessPoolExecutor(processes) as executor:
+        return list(executor.map(model_check, itertools.repeat(knowledge),
+                                 queries))
+
+
+def _check_all(knowledge, query, model, symbols, stop=None):
+    """
+    Checks if knowledge base entails query over every assignment of
+    symbols extending model. Returns None if stopped early.
+    """
+
+    # If knowledge base is true in any model, then query must also be true
+    circuit = Circuit([knowledge, query], model)
+    for step, _ in enumerate(circuit.walk(symbols)):
+        if circuit.value(0) and not circuit.value(1):
+            return False
+        if stop is not None and not step % 4096 and stop.is_set():
+            return None
+    return True
+
+
+# Event set by any worker process that finds a counterexample
+_stop = None
+
+
+def _start_worker(stop):
+    global _stop
+    _stop = stop
+
+
+def _check_cube(knowledge, query, model, symbols):
+    result = _check_all(knowledge, query, model, symbols, _stop)
+    if result is False:
+        _stop.set()
+    return result
+
+
+def _check_parallel(knowledge, query, model, symbols, processes):
+    """Checks entailment by splitting the first symbols across processes."""
+
+    # Make several cubes per process so that uneven cubes balance out
+    split = min((processes * 4 - 1).bit_length(), len(symbols))
+    fixed, rest = symbols[:split], symbols[split:]
+
+    stop = multiprocessing.Event()
+    with ProcessPoolExecutor(processes, initializer=_start_worker,
+                             initargs=(stop,)) as executor:
+        futures = []
+        for values in itertools.product([False, True], repeat=split):
+            cube = {**model, **dict(zip(fixed, values))}
+            futures.append(
+                executor.submit(_check_cube, knowledge, query, cube, rest)
+            )
+        try:
+            for future in as_completed(futures):
+                if future.result() is False:
+                    return False
+        finally:
+            stop.set()
+            for future in futures:
+                future.cancel()
+    return True
+
+
+def model_check_bitwise(knowledge, query):
+    """
+    Checks if knowledge base entails query by computing truth tables of
+    both over all assignments at once, as integer bitmasks.
+    """
+    names = sorted(set.union(knowledge.symbols(), query.symbols()))
+    tables = truth_tables([knowledge, query], names)
+    return not tables[0] & ~tables[1]
+
+
+def truth_tables(sentences, names):
+    """
+    Returns the truth table of each sentence over names as an integer
+    whose bit i is set if the sentence is true in the assignment where
+    names[j] is true exactly when bit j of i is set.
+    """
+    size = 1 << len(names)
+    full = (1 << size) - 1
+
+    # Truth tables of symbols: alternating runs of 2^j false and true bits
+    tables = dict()
+    for j, name in enumerate(names):
+        run = 1 << j
+        table = ((1 << run) - 1) << run
+        length = run * 2
+        while length < size:
+            table |= table << length
+            length *= 2
+        tables[name] = table
+
+    computed = dict()
+
+    def table(sentence):
+        if isinstance(sentence, Symbol):
+            return tables[sentence.name]
+        if id(sentence) in computed:
+            return computed[id(sentence)]
+        if isinstance(sentence, Not):
+            result = full ^ table(sentence.operand)
+        elif isinstance(sentence, And):
+            result = full
+            for conjunct in sentence.conjuncts:
+                result &= table(conjunct)
+        elif isinstance(sentence, Or):
+            result = 0
+            for disjunct in sentence.disjuncts:
+                result |= table(disjunct)
+        elif isinstance(sentence, Implication):
+            result = (full ^ table(sentence.antecedent)) | table(
+                sentence.consequent
+            )
+        elif isinstance(sentence, Biconditional):
+            result = full ^ table(sentence.left) ^ table(sentence.right)
+        elif isinstance(sentence, Cardinality) and (
+            sentence.low > sentence.high
+        ):
+            result = 0
+        elif isinstance(sentence, Cardinality):
+
+            # at_least[j] holds where at least j operands so far are true
+            at_least = [full] + [0] * (sentence.high + 1)
+            for operand in sentence.operands:
+                operand = table(operand)
+                for j in range(len(at_least) - 1, 0, -1):
+                    at_least[j] |= operand & at_least[j - 1]
+            result = at_least[sentence.low] & ~at_least[sentence.high + 1]
+        else:
+            raise TypeError(f"cannot tabulate {type(sentence).__name__}")
+        computed[id(sentence)] = result
+        return result
+
+    return [table(sentence) for sentence in sentences]
+
+
+class KnowledgeBase():
+    """
+    Knowledge base that accepts sentences one at a time and answers
+    entailment queries with a clause learning solver.
+
+    Sentences are translated to clauses once, when told. Facts propagated
+    from the knowledge base and clauses learned while answering queries
+    are kept between calls to `ask`, so each query starts from everything
+    derived so far. `push` saves a checkpoint and `pop` restores it,
+    discarding everything told or learned since.
+
+    Cardinality constraints told at the top level use a compact
+    sequential counter whose auxiliary variables are only bounded, not
+    defined. If `definitional` is True, every auxiliary variable is
+    instead defined as equivalent to a subformula, as model counting needs.
+    """
+
+    def __init__(self, *sentences, definitional=False):
+        self.definitional = definitional
+
+        # Symbol names and gates, mapped to solver literals
+        self.variables = dict()
+        self.names = [None]
+        self.gates = dict()
+
+        # Gate definitions are kept forever, told and learned clauses
+        # are discarded when their checkpoint is popped
+        self.definitions = []
+        self.clauses = []
+        self.learned = []
+        self.frames = []
+        self.inconsistent = False
+
+        # Solver state, indexed by variable
+        self.assigns = [None]
+        self.level = [0]
+        self.reason = [None]
+        self.activity = [0.0]
+        self.phase = [False]
+        self.order = []
+        self.increment = 1.0
+        self.watches = defaultdict(list)
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+
+        # Constant true, used for empty conjunctions and disjunctions
+        self.true = self._new_variable(None)
+        self._add_clause([self.true], self.definitions)
+
+        for sentence in sentences:
+            self.tell(sentence)
+
+    def tell(self, sentence):
+        """Adds a sentence to the knowledge base."""
+        Sentence.validate(sentence)
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.tell(conjunct)
+        elif isinstance(sentence, Or):
+            self._add_clause(
+                [self._literal(disjunct) for disjunct in sentence.disjuncts],
+                self.clauses
+            )
+        elif isinstance(sentence, Cardinality) and not self.definitional:
+            literals = [self._literal(operand)
+                        for operand in sentence.operands]
+            low = sentence.low
+            if low > min(sentence.high, len(literals)):
+                self._add_clause([-self.true], self.clauses)
+                return
+            if low > 0:
+                self._at_most([-literal for literal in literals],
+                              len(literals) - low)
+            self._at_most(literals, sentence.high)
+        else:
+            self._add_clause([self._literal(sentence)], self.clauses)
+
+    def ask(self, query):
+        """Checks if knowledge base entails query."""
+        Sentence.validate(query)
+        literal = self._literal(query)
+        return not self._solve([-literal])
+
+    def push(self):
+        """Saves a checkpoint that a later `pop` returns to."""
+        self.frames.append((len(self.clauses), len(self.learned)))
+
+    def pop(self):
+        """Discards everything told or learned since the last `push`."""
+        if not self.frames:
+            raise Exception("no checkpoint to pop")
+        told, learned = self.frames.pop()
+        del self.clauses[told:]
+        del self.learned[learned:]
+        self._rebuild()
+
+    def _new_variable(self, name):
+        variable = len(self.assigns)
+        self.names.append(name)
+        self.assigns.append(None)
+        self.level.append(0)
+        self.reason.append(None)
+        self.activity.append(0.0)
+        self.phase.append(False)
+        heapq.heappush(self.order, (0.0, variable))
+        return variable
+
+    def _variable(self, name):
+        if name not in self.variables:
+            self.variables[name] = self._new_variable(name)
+        return self.variables[name]
+
+    def _literal(self, sentence):
+        """Returns a literal equivalent to sentence, defining gates as needed."""
+        if isinstance(sentence, Symbol):
+            return self._variable(sentence.name)
+        if isinstance(sentence, Not):
+            return -self._literal(sentence.operand)
+        if isinstance(sentence, And):
+            return self._and([self._literal(conjunct)
+                              for conjunct in sentence.conjuncts])
+        if isinstance(sentence, Or):
+            return -self._and([-self._literal(disjunct)
+                               for disjunct in sentence.disjuncts])
+        if isinstance(sentence, Implication):
+            return -self._and([self._literal(sentence.antecedent),
+                               -self._literal(sentence.consequent)])
+        if isinstance(sentence, Biconditional):
+            return self._iff(self._literal(sentence.left),
+                             self._literal(sentence.right))
+        if isinstance(sentence, Cardinality):
+            # Operands are still encoded, so their symbols get variables
+            literals = [self._literal(operand)
+                        for operand in sentence.operands]
+            if sentence.low > sentence.high:
+                return -self.true
+            at_least = self._counter(literals, sentence.high + 1)
+            return self._and([at_least[sentence.low],
+                              -at_least[sentence.high + 1]])
+        raise TypeError(f"cannot encode {type(sentence).__name__}")
+
+    def _counter(self, literals, limit):
+        """
+        Returns literals for "at least j of literals are true" for each j
+        up to limit, built as a sequential counter of defined gates.
+        """
+        at_least = [self.true] + [-self.true] * limit
+        for literal in literals:
+            for j in range(limit, 0, -1):
+                at_least[j] = -self._and([
+                    -at_least[j], -self._and([literal, at_least[j - 1]])
+                ])
+        return at_least
+
+    def _at_most(self, literals, k):
+        """
+        Tells that at most k of literals are true, with the sequential
+        counter encoding: counter[i][j] is implied when at least j + 1 of
+        the first i + 1 literals are true.
+        """
+        n = len(literals)
+        if k >= n:
+            return
+        if k <= 0:
+            for literal in literals:
+                self._add_clause([-literal], self.clauses)
+            return
+
+        counter = [[self._new_variable(None) for _ in range(k)]
+                   for _ in range(n - 1)]
+        for i in range(n - 1):
+            self._add_clause([-literals[i], counter[i][0]], self.clauses)
+            if i > 0:
+                for j in range(k):
+                    self._add_clause([-counter[i - 1][j], counter[i][j]],
+                                     self.clauses)
+                for j in range(1, k):
+                    self._add_clause([-literals[i], -counter[i - 1][j - 1],
+                                      counter[i][j]], self.clauses)
+                self._add_clause([-literals[i], -counter[i - 1][k - 1]],
+                                 self.clauses)
+            else:
+                for j in range(1, k):
+                    self._add_clause([-counter[0][j]], self.clauses)
+        self._add_clause([-literals[n - 1], -counter[n - 2][k - 1]],
+                         self.clauses)
+
+    def _and(self, literals):
+        """Returns a literal that is true exactly when all literals are."""
+        literals = set(literals)
+        literals.discard(self.true)
+        if -self.true in literals or any(-l in literals for l in literals):
+            return -self.true
+        if not literals:
+            return self.true
+        if len(literals) == 1:
+            return literals.pop()
+
+        key = ("and", frozenset(literals))
+        if key not in self.gates:
+            gate = self._new_variable(None)
+            for literal in literals:
+                self._add_clause([-gate, literal], self.definitions)
+            self._add_clause([gate] + [-l for l in literals], self.definitions)
+            self.gates[key] = gate
+        return self.gates[key]
+
+    def _iff(self, left, right):
+        """Returns a literal that is true exactly when left equals right."""
+        sign = 1
+        if left < 0:
+            left, sign = -left, -sign
+        if right < 0:
+            right, sign = -right, -sign
+        if left == right:
+            return sign * self.true
+        left, right = min(left, right), max(left, right)
+
+        key = ("iff", left, right)
+        if key not in self.gates:
+            gate = self._new_variable(None)
+            self._add_clause([-gate, -left, right], self.definitions)
+            self._add_clause([-gate, left, -right], self.definitions)
+            self._add_clause([gate, left, right], self.definitions)
+            self._add_clause([gate, -left, -right], self.definitions)
+            self.gates[key] = gate
+        return sign * self.gates[key]
+
+    def _value(self, literal):
+        value = self.assigns[abs(literal)]
+        if value is None or literal > 0:
+            return value
+        return not value
+
+    def _assign(self, literal, reason):
+        variable = abs(literal)
+        self.assigns[variable] = literal > 0
+        self.level[variable] = len(self.trail_lim)
+        self.reason[variable] = reason
+        self.trail.append(literal)
+
+    def _add_clause(self, literals, store):
+        """Stores a clause, dropping it if it is a tautology."""
+        clause = list(dict.fromkeys(literals))
+        if any(-literal in clause for literal in clause):
+            return
+        store.append(clause)
+        self._attach(clause)
+
+    def _attach(self, clause):
+        """Watches a clause at decision level 0, propagating if it is unit."""
+        if self.inconsistent:
+            return
+        if not clause:
+            self.inconsistent = True
+            return
+
+        # Watch literals that are not false wherever possible
+        rank = {True: 0, None: 1, False: 2}
+        clause.sort(key=lambda literal: rank[self._value(literal)])
+        if len(clause) >= 2:
+            self.watches[clause[0]].append(clause)
+            self.watches[clause[1]].append(clause)
+
+        first = self._value(clause[0])
+        if first is False:
+            self.inconsistent = True
+        elif first is None and (
+            len(clause) == 1 or self._value(clause[1]) is False
+        ):
+            self._assign(clause[0], clause)
+            if self._propagate() is not None:
+                self.inconsistent = True
+
+    def _rebuild(self):
+        """Resets the solver and re-derives all facts from stored clauses."""
+        for variable in range(1, len(self.assigns)):
+            self.assigns[variable] = None
+            self.reason[variable] = None
+        self.order = [(-self.activity[variable], variable)
+                      for variable in range(1, len(self.assigns))]
+        heapq.heapify(self.order)
+        self.watches = defaultdict(list)
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.inconsistent = False
+        for store in (self.definitions, self.clauses, self.learned):
+            for clause in store:
+                self._attach(clause)
+
+    def _propagate(self):
+        """Propagates assigned literals, returning a conflicting clause if any."""
+        while self.qhead < len(self.trail):
+            false_literal = -self.trail[self.qhead]
+            self.qhead += 1
+            watchers = self.watches[false_literal]
+            self.watches[false_literal] = kept = []
+
+            for i, clause in enumerate(watchers):
+
+                # Keep the false literal in the second watched position
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                first = clause[0]
+                if self._value(first) is True:
+                    kept.append(clause)
+                    continue
+
+                # Look for a new literal to watch
+                for k in range(2, len(clause)):
+                    if self._value(clause[k]) is not False:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches[clause[1]].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if self._value(first) is False:
+                        kept.extend(watchers[i + 1:])
+                        self.qhead = len(self.trail)
+                        return clause
+                    self._assign(first, clause)
+        return None
+
+    def _analyze(self, conflict):
+        """Learns a first-UIP clause, returning it with its backjump level."""
+        level = len(self.trail_lim)
+        learnt = [None]
+        seen = set()
+        counter = 0
+        literal = None
+        index = len(self.trail) - 1
+        clause = conflict
+
+        while True:
+            for other in clause:
+                variable = abs(other)
+                if other == literal or variable in seen:
+                    continue
+                if self.level[variable] > 0:
+                    seen.add(variable)
+                    self._bump(variable)
+                    if self.level[variable] == level:
+                        counter += 1
+                    else:
+                        learnt.append(other)
+
+            # Resolve on the latest seen literal of the conflict level
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            counter -= 1
+            if counter == 0:
+                break
+            clause = self.reason[abs(literal)]
+
+        learnt[0] = -literal
+        if len(learnt) == 1:
+            return learnt, 0
+
+        # Watch the literal that becomes false last after backjumping
+        deepest = max(range(1, len(learnt)),
+                      key=lambda i: self.level[abs(learnt[i])])
+        learnt[1], learnt[deepest] = learnt[deepest], learnt[1]
+        return learnt, self.level[abs(learnt[1])]
+
+    def _bump(self, variable):
+        self.activity[variable] += self.increment
+        if self.activity[variable] > 1e100:
+            for other in range(1, len(self.activity)):
+                self.activity[other] *= 1e-100
+            self.increment *= 1e-100
+        heapq.heappush(self.order, (-self.activity[variable], variable))
+
+    def _backtrack(self, level):
+        if len(self.trail_lim) <= level:
+            return
+        start = self.trail_lim[level]
+        for literal in self.trail[start:]:
+            variable = abs(literal)
+            self.phase[variable] = literal > 0
+            self.assigns[variable] = None
+            self.reason[variable] = None
+            heapq.heappush(self.order, (-self.activity[variable], variable))
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def _pick(self):
+        """Returns the unassigned variable with highest activity, if any."""
+        while self.order:
+            _, variable = heapq.heappop(self.order)
+            if self.assigns[variable] is None:
+                return variable
+        return None
+
+    def _solve(self, assumptions):
+        """Checks if knowledge base is satisfiable under assumptions."""
+        if self.inconsistent:
+            return False
+        satisfiable = self._search(assumptions)
+        self._backtrack(0)
+        return satisfiable
+
+    def _search(self, assumptions):
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+
+                # A conflict without decisions means no model exists
+                if not self.trail_lim:
+                    self.inconsistent = True
+                    return False
+                learnt, level = self._analyze(conflict)
+                self._backtrack(level)
+                self.learned.append(learnt)
+                if len(learnt) >= 2:
+                    self.watches[learnt[0]].append(learnt)
+                    self.watches[learnt[1]].append(learnt)
+                self._assign(learnt[0], learnt)
+                self.increment /= 0.95
+                continue
+
+            # Decide assumptions first, each on its own level
+            level = len(self.trail_lim)
+            if level < len(assumptions):
+                literal = assumptions[level]
+                value = self._value(literal)
+                if value is False:
+                    return False
+                self.trail_lim.append(len(self.trail))
+                if value is None:
+                    self._assign(literal, None)
+                continue
+
+            variable = self._pick()
+            if variable is None:
+                return True
+            self.trail_lim.append(len(self.trail))
+            self._assign(variable if self.phase[variable] else -variable, None)
+
+
+def count_models(knowledge, symbols=()):
+    """
+    Returns the number of models of knowledge.
+
+    Models range over the symbols in knowledge plus any extra `symbols`.
+    Counting splits the clauses of knowledge into independent components
+    and caches the count of every component it solves, rather than
+    enumerating assignments.
+    """
+    encoding = _encode(knowledge, symbols)
+    if encoding.inconsistent:
+        return 0
+    clauses = _clause_set(encoding)
+    free = len(encoding.assigns) - 1 - len(_variables(clauses))
+    return _ModelCounter().count(clauses) << free
+
+
+def iter_models(knowledge, symbols=()):
+    """
+    Lazily yields each model of knowledge as a dict of symbol names to
+    truth values. Models range over the same symbols as `count_models`.
+
+    Models are generated from the same component decomposition used for
+    counting, and branches with a cached count of zero are never entered.
+    """
+    encoding = _encode(knowledge, symbols)
+    if encoding.inconsistent:
+        return
+    clauses = _clause_set(encoding)
+    constrained = _variables(clauses)
+    free = [variable for name, variable in sorted(encoding.variables.items())
+            if variable not in constrained]
+
+    for model in _ModelCounter().models(clauses):
+        true = set(model)
+        for values in _expand(free):
+            true.update(values)
+            yield {name: variable in true
+                   for name, variable in encoding.variables.items()}
+            true.difference_update(values)
+
+
+def _encode(knowledge, symbols):
+    """Encodes knowledge as clauses, with a variable for every symbol."""
+    encoding = KnowledgeBase(knowledge, definitional=True)
+    for symbol in symbols:
+        encoding._variable(symbol.name)
+    return encoding
+
+
+def _clause_set(encoding):
+    return {frozenset(clause)
+            for clause in encoding.definitions + encoding.clauses}
+
+
+def _variables(clauses):
+    return {abs(literal) for clause in clauses for literal in clause}
+
+
+def _condition(clauses, assigned):
+    """
+    Simplifies clauses under assigned literals, propagating units.
+    Returns the remaining clauses and all assigned literals, or None
+    for the clauses if a conflict arises.
+    """
+    assigned = set(assigned)
+    while True:
+        reduced = set()
+        units = set()
+        for clause in clauses:
+            if not clause.isdisjoint(assigned):
+                continue
+            remaining = frozenset(
+                literal for literal in clause if -literal not in assigned
+            )
+            if not remaining:
+                return None, assigned
+            if len(remaining) == 1:
+                units |= remaining
+            reduced.add(remaining)
+        if not units:
+            return reduced, assigned
+        if any(-unit in units for unit in units):
+            return None, assigned
+        assigned |= units
+        clauses = reduced
+
+
+def _expand(variables):
+    """Yields every assignment of variables as a tuple of literals."""
+    return itertools.product(*[(variable, -variable) for variable in variables])
+
+
+class _ModelCounter():
+    """Counts models of clause sets with component decomposition and caching."""
+
+    def __init__(self):
+        self.cache = dict()
+
+    def count(self, clauses):
+        """Returns the number of models over the variables in clauses."""
+        if not clauses:
+            return 1
+        key = frozenset(clauses)
+        if key in self.cache:
+            return self.cache[key]
+
+        components = self.components(clauses)
+        if len(components) > 1:
+            total = 1
+            for component in components:
+                total *= self.count(component)
+                if not total:
+                    break
+        else:
+            total = 0
+            for _, reduced, free in self.branches(clauses):
+                total += self.count(reduced) << len(free)
+
+        self.cache[key] = total
+        return total
+
+    def models(self, clauses):
+        """Yields the models of clauses as tuples of literals."""
+        if not self.count(clauses):
+            return
+        if not clauses:
+            yield ()
+            return
+
+        components = self.components(clauses)
+        if len(components) > 1:
+            yield from self.product(components)
+            return
+
+        for assigned, reduced, free in self.branches(clauses):
+            if not self.count(reduced):
+                continue
+            for model in self.models(reduced):
+                for values in _expand(free):
+                    yield assigned + model + values
+
+    def product(self, components):
+        """Yields combined models of independent components."""
+        if not components:
+            yield ()
+            return
+        for model in self.models(components[0]):
+            for rest in self.product(components[1:]):
+                yield model + rest
+
+    def branches(self, clauses):
+        """
+        Sets the most frequent variable each way, returning the literals
+        assigned, the clauses left and the variables that no longer occur
+        for every branch without a conflict.
+        """
+        occurrences = defaultdict(int)
+        for clause in clauses:
+            for literal in clause:
+                occurrences[abs(literal)] += 1
+        variable = max(occurrences, key=occurrences.get)
+
+        branches = []
+        for literal in (variable, -variable):
+            reduced, assigned = _condition(clauses, {literal})
+            if reduced is None:
+                continue
+            free = (occurrences.keys() - {abs(l) for l in assigned}
+                    - _variables(reduced))
+            branches.append((tuple(assigned), reduced, free))
+        return branches
+
+    @staticmethod
+    def components(clauses):
+        """Splits clauses into groups that share no variables."""
+        parent = dict()
+
+        def find(variable):
+            while parent.setdefault(variable, variable) != variable:
+                parent[variable] = parent[parent[variable]]
+                variable = parent[variable]
+            return variable
+
+        for clause in clauses:
+            first, *rest = [find(abs(literal)) for literal in clause]
+            for other in rest:
+                parent[find(other)] = find(first)
+
+        groups = defaultdict(list)
+        for clause in clauses:
+            groups[find(abs(next(iter(clause))))].append(clause)
+        return list(groups.values())
+
+
+# Operators accepted by `parse`, with ASCII alternatives
+_TOKENS = re.compile(r"(<=>|=>|¬|~|∧|&|∨|\||\(|\)|,)")
+_OPERATORS = {"~": "¬", "&": "∧", "|": "∨"}
+_CARDINALITIES = {"ExactlyOne": ExactlyOne, "AtMostK": AtMostK,
+                  "AtLeastK": AtLeastK}
+
+
+def parse(text):
+    """
+    Parses a sentence written in the syntax produced by `formula`.
+
+    From tightest to loosest binding, the operators are ¬ (or ~),
+    ∧ (or &), ∨ (or |), => and <=>. Implication groups to the right.
+    Cardinality constraints are written as calls, such as
+    AtMostK(2, a, b, c). Any other run of text between operators is a
+    symbol name, with surrounding whitespace removed.
+    """
+    tokens = []
+    for i, part in enumerate(_TOKENS.split(text)):
+        if i % 2:
+            tokens.append(_OPERATORS.get(part, part))
+        elif part.strip():
+            tokens.append(Symbol(part.strip()))
+    tokens.reverse()
+
+    def peek():
+        return tokens[-1] if tokens else None
+
+    def expect(token):
+        if peek() != token:
+            found = "end of input" if not tokens else repr(peek())
+            raise ValueError(f"expected {token!r}, found {found}")
+        tokens.pop()
+
+    def biconditional():
+        left = implication()
+        while peek() == "<=>":
+            tokens.pop()
+            left = Biconditional(left, implication())
+        return left
+
+    def implication():
+        antecedent = disjunction()
+        if peek() == "=>":
+            tokens.pop()
+            return Implication(antecedent, implication())
+        return antecedent
+
+    def disjunction():
+        disjuncts = [conjunction()]
+        while peek() == "∨":
+            tokens.pop()
+            disjuncts.append(conjunction())
+        return disjuncts[0] if len(disjuncts) == 1 else Or(*disjuncts)
+
+    def conjunction():
+        conjuncts = [negation()]
+        while peek() == "∧":
+            tokens.pop()
+            conjuncts.append(negation())
+        return conjuncts[0] if len(conjuncts) == 1 else And(*conjuncts)
+
+    def negation():
+        token = peek()
+        if token is None:
+            raise ValueError("unexpected end of input")
+        tokens.pop()
+        if token == "¬":
+            return Not(negation())
+        if token == "(":
+            sentence = biconditional()
+            expect(")")
+            return sentence
+        if isinstance(token, Symbol):
+            if token.name in _CARDINALITIES and peek() == "(":
+                return cardinality(_CARDINALITIES[token.name])
+            return token
+        raise ValueError(f"unexpected {token!r}")
+
+    def cardinality(kind):
+        expect("(")
+        arguments = []
+        if kind is not ExactlyOne:
+            token = peek()
+            if not isinstance(token, Symbol) or not token.name.isdigit():
+                raise ValueError(f"expected a count, found {token!r}")
+            tokens.pop()
+            arguments.append(int(token.name))
+            if peek() != ")":
+                expect(",")
+
+        # Constraints on no operands are written with none, as in AtMostK(2)
+        if peek() != ")":
+            arguments.append(biconditional())
+            while peek() == ",":
+                tokens.pop()
+                arguments.append(biconditional())
+        expect(")")
+        return kind(*arguments)
+
+    sentence = biconditional()
+    if tokens:
+        raise ValueError(f"unexpected {peek()!r}")
+    return sentence
+
+
+def iter_dimacs(lines, names=None):
+    """
+    Yields the clauses of a DIMACS CNF file as lists of integer literals,
+    reading one line at a time. If `names` is a dict, it is filled from
+    comment lines of the form "c <variable> <name>".
+    """
+    clause = []
+    for line in lines:
+        if not line or line[0] == "p":
+            continue
+        if line[0] == "c":
+            if names is not None:
+                fields = line.split(maxsplit=2)
+                if len(fields) == 3 and fields[1].isdigit():
+                    names[int(fields[1])] = fields[2].strip()
+            continue
+        if line[0] == "%":
+            break
+        for token in line.split():
+            literal = int(token)
+            if literal:
+                clause.append(literal)
+            else:
+                yield clause
+                clause = []
+    if clause:
+        yield clause
+
+
+def load_dimacs(path, knowledge=None):
+    """
+    Tells the clauses of a DIMACS CNF file to a knowledge base, creating
+    one if not given, and returns it. Variables are named from
+    "c <variable> <name>" comments; any others, such as auxiliary
+    variables written by save_dimacs, get new unnamed variables.
+    """
+    if knowledge is None:
+        knowledge = KnowledgeBase()
+    names = dict()
+    variables = dict()
+
+    def literal(number):
+        variable = abs(number)
+        if variable not in variables:
+            if variable in names:
+                variables[variable] = knowledge._variable(names[variable])
+            else:
+                variables[variable] = knowledge._new_variable(None)
+        return variables[variable] if number > 0 else -variables[variable]
+
+    with open(path) as f:
+        for clause in iter_dimacs(f, names):
+            knowledge._add_clause([literal(number) for number in clause],
+                                  knowledge.clauses)
+    return knowledge
+
+
+def save_dimacs(knowledge, path):
+    """
+    Writes a sentence or knowledge base to a DIMACS CNF file, naming each
+    symbol's variable in a comment. Auxiliary variables introduced by the
+    clause encoding have no name.
+    """
+    if not isinstance(knowledge, KnowledgeBase):
+        knowledge = KnowledgeBase(knowledge)
+    clauses = knowledge.definitions + knowledge.clauses
+    with open(path, "w") as f:
+        f.write(f"p cnf {len(knowledge.assigns) - 1} {len(clauses)}\n")
+        for name, variable in knowledge.variables.items():
+            f.write(f"c {variable} {name}\n")
+        for clause in clauses:
+            f.write(" ".join(map(str, clause)) + " 0\n")
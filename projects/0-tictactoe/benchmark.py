@@ -0,0 +1,78 @@
+"""
+Compares nodes searched by plain minimax and by the alpha-beta
+search in tictactoe.py, from the empty board and every opening move.
+
+Usage: python benchmark.py
+"""
+
+import math
+import time
+
+import bitboard
+import tictactoe as ttt
+
+
+def plain_minimax(board):
+    """
+    Exhaustive minimax without pruning or caching, as tictactoe.py
+    searched before. Returns the optimal action and nodes searched.
+    """
+    nodes = 0
+
+    def value(board):
+        nonlocal nodes
+        nodes += 1
+        if ttt.terminal(board):
+            return ttt.utility(board)
+        values = (value(ttt.result(board, action))
+                  for action in ttt.actions(board))
+        return max(values) if ttt.player(board) == ttt.X else min(values)
+
+    best = -math.inf if ttt.player(board) == ttt.X else math.inf
+    best_action = None
+    for action in ttt.actions(board):
+        v = value(ttt.result(board, action))
+        if (v > best) if ttt.player(board) == ttt.X else (v < best):
+            best, best_action = v, action
+    return best_action, nodes + 1
+
+
+def alpha_beta(board):
+    """
+    Runs the alpha-beta search in tictactoe.py with an empty
+    transposition table, bypassing the opening book that minimax
+    answers from. Returns the action and nodes searched.
+    """
+    ttt.clear_cache()
+    x, o = bitboard.from_board(board)
+    if bitboard.player(x, o) == ttt.X:
+        _, move = ttt.max_value(x, o)
+    else:
+        _, move = ttt.min_value(x, o)
+    return bitboard.cell(move), ttt.cache_info()["nodes"]
+
+
+def main():
+    positions = [("empty", ttt.initial_state())]
+    for action in ttt.MOVE_ORDER:
+        positions.append((f"X at {action}",
+                          ttt.result(ttt.initial_state(), action)))
+
+    print(f"{'position':>14} {'minimax':>10} {'alpha-beta':>11} "
+          f"{'ratio':>8} {'speedup':>8}")
+    for name, board in positions:
+        start = time.perf_counter()
+        _, plain_nodes = plain_minimax(board)
+        plain_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, pruned_nodes = alpha_beta(board)
+        pruned_time = time.perf_counter() - start
+
+        print(f"{name:>14} {plain_nodes:>10} {pruned_nodes:>11} "
+              f"{plain_nodes / pruned_nodes:>7.0f}x "
+              f"{plain_time / pruned_time:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Tic Tac Toe state as two 9-bit integers, one per player.
+
+Cell (i, j) is bit 3 * i + j. A state is a pair (x, o) of the cells
+taken by each player.
+"""
+
+X = "X"
+O = "O"
+
+FULL = 0b111111111
+
+# Rows, columns and diagonals
+LINES = [
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100
+]
+
+
+def _symmetries():
+    """
+    Returns the 8 rotations and reflections of the board, each as a
+    list mapping a cell's bit index to its index after the transform.
+    """
+    symmetries = []
+    for reflect in (False, True):
+        for turns in range(4):
+            permutation = []
+            for index in range(9):
+                i, j = divmod(index, 3)
+                if reflect:
+                    j = 2 - j
+                for _ in range(turns):
+                    i, j = j, 2 - i
+                permutation.append(3 * i + j)
+            symmetries.append(permutation)
+    return symmetries
+
+
+SYMMETRIES = _symmetries()
+
+
+
+def _transforms(permutation):
+    """
+    Returns the transformed mask of every 9-bit mask, each built from
+    the mask without its lowest bit.
+    """
+    table = [0] * (FULL + 1)
+    for mask in range(1, FULL + 1):
+        low = mask & -mask
+        table[mask] = (table[mask ^ low]
+                       | 1 << permutation[low.bit_length() - 1])
+    return table
+
+
+# For each symmetry, the transformed mask of every 9-bit mask
+TRANSFORMS = [_transforms(permutation) for permutation in SYMMETRIES]
+
+
+def bit(cell):
+    """
+    Returns the bit for cell (i, j).
+    """
+    i, j = cell
+    return 1 << (3 * i + j)
+
+
+def cell(bit):
+    """
+    Returns the cell (i, j) for a single-bit move.
+    """
+    return divmod(bit.bit_length() - 1, 3)
+
+
+def key(x, o):
+    """
+    Returns the state packed into one 18-bit integer.
+    """
+    return x | o << 9
+
+
+def from_board(board):
+    """
+    Returns the state (x, o) of a 3x3 list board.
+    """
+    x = o = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == X:
+                x |= 1 << (3 * i + j)
+            elif board[i][j] == O:
+                o |= 1 << (3 * i + j)
+    return x, o
+
+
+def to_board(x, o):
+    """
+    Returns the 3x3 list board of state (x, o).
+    """
+    return [[X if x >> (3 * i + j) & 1
+             else O if o >> (3 * i + j) & 1
+             else None
+             for j in range(3)]
+            for i in range(3)]
+
+
+def player(x, o):
+    """
+    Returns player who has the next turn.
+    """
+    return X if x.bit_count() <= o.bit_count() else O
+
+
+def actions(x, o):
+    """
+    Returns the list of free cells, each as a single-bit move.
+    """
+    moves = []
+    free = FULL & ~(x | o)
+    while free:
+        move = free & -free
+        moves.append(move)
+        free ^= move
+    return moves
+
+
+def result(x, o, move):
+    """
+    Returns the state after the player to move takes the move bit.
+    """
+    if (x | o) & move:
+        raise ValueError("cell already taken")
+    if player(x, o) == X:
+        return x | move, o
+    return x, o | move
+
+
+def won(cells):
+    """
+    Returns True if cells contain a complete line.
+    """
+    for line in LINES:
+        if cells & line == line:
+            return True
+    return False
+
+
+def winner(x, o):
+    """
+    Returns the winner, if there is one.
+    """
+    if won(x):
+        return X
+    if won(o):
+        return O
+    return None
+
+
+def terminal(x, o):
+    """
+    Returns True if game is over.
+    """
+    return (x | o) == FULL or won(x) or won(o)
+
+
+def utility(x, o):
+    """
+    Returns 1 if X has won, -1 if O has won, 0 otherwise.
+    """
+    if won(x):
+        return 1
+    if won(o):
+        return -1
+    return 0
+
+
+def canonical(x, o):
+    """
+    Returns the smallest key of state (x, o) under the 8 symmetries of
+    the board, and the index of the symmetry that produces it.
+    """
+    return min((key(transform[x], transform[o]), symmetry)
+               for symmetry, transform in enumerate(TRANSFORMS))
+
+
+def transform_move(move, symmetry, inverse=False):
+    """
+    Returns a move bit mapped through a symmetry, or back if inverse.
+    """
+    if inverse:
+        return 1 << SYMMETRIES[symmetry].index(move.bit_length() - 1)
+    return TRANSFORMS[symmetry][move]
@@ -0,0 +1,111 @@
+"""
+Opening book of every reachable Tic Tac Toe position, up to rotation
+and reflection, with its minimax value and best move.
+
+Usage: python book.py
+
+Solves all positions with the search in tictactoe.py and writes them
+to book.bin, which tictactoe.py loads at import time.
+"""
+
+import array
+import os
+import sys
+
+import bitboard
+
+BOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+
+# Each entry is one 32-bit integer: the canonical state key in the low
+# 18 bits, then the best move's cell index (NO_MOVE if terminal) in
+# 4 bits, then the value plus one in 2 bits
+KEY_BITS = 18
+MOVE_BITS = 4
+NO_MOVE = 15
+
+
+def positions():
+    """
+    Returns the canonical keys of all positions reachable from the
+    empty board, with a representative state (x, o) for each.
+    """
+    found = dict()
+    frontier = [(0, 0)]
+    while frontier:
+        x, o = frontier.pop()
+        key, _ = bitboard.canonical(x, o)
+        if key in found:
+            continue
+        found[key] = (x, o)
+        if not bitboard.terminal(x, o):
+            for move in bitboard.actions(x, o):
+                frontier.append(bitboard.result(x, o, move))
+    return found
+
+
+def build(path=BOOK):
+    """
+    Solves every canonical position and writes the book to path.
+    Returns the number of positions written.
+    """
+    import tictactoe
+
+    entries = array.array("I")
+    for key, (x, o) in sorted(positions().items()):
+
+        # Solve the canonical form, so moves are stored in its frame
+        x, o = key & bitboard.FULL, key >> 9
+        if bitboard.terminal(x, o):
+            value, index = bitboard.utility(x, o), NO_MOVE
+        else:
+            if bitboard.player(x, o) == bitboard.X:
+                value, move = tictactoe.max_value(x, o)
+            else:
+                value, move = tictactoe.min_value(x, o)
+            index = move.bit_length() - 1
+        entries.append(key | index << KEY_BITS
+                       | (value + 1) << (KEY_BITS + MOVE_BITS))
+
+    if sys.byteorder == "big":
+        entries.byteswap()
+    with open(path, "wb") as f:
+        entries.tofile(f)
+    return len(entries)
+
+
+def load(path=BOOK):
+    """
+    Returns the book at path as a dict of canonical key to packed move
+    and value, or an empty dict if the book has not been built.
+    """
+    entries = array.array("I")
+    try:
+        with open(path, "rb") as f:
+            entries.frombytes(f.read())
+    except FileNotFoundError:
+        return dict()
+    if sys.byteorder == "big":
+        entries.byteswap()
+    mask = (1 << KEY_BITS) - 1
+    return {entry & mask: entry >> KEY_BITS for entry in entries}
+
+
+def lookup(book, x, o):
+    """
+    Returns the value and best move bit of state (x, o) from the book,
+    the move being None for terminal states. Returns None if the state
+    is not in the book.
+    """
+    key, symmetry = bitboard.canonical(x, o)
+    entry = book.get(key)
+    if entry is None:
+        return None
+    index = entry & ((1 << MOVE_BITS) - 1)
+    value = (entry >> MOVE_BITS) - 1
+    if index == NO_MOVE:
+        return value, None
+    return value, bitboard.transform_move(1 << index, symmetry, inverse=True)
+
+
+if __name__ == "__main__":
+    print(f"Wrote {build()} positions to {BOOK}")
@@ -0,0 +1,218 @@
+"""
+Monte Carlo Tree Search player for any game with the tictactoe.py
+interface: player, actions, result, terminal and utility.
+
+The game is the tictactoe module itself, or an object with the same
+methods such as mnk.Game(15, 15, 5). Given more than one process,
+playouts run in a process pool with root parallelization: every process
+grows its own tree from the same board, and the root statistics are
+summed to pick the move.
+"""
+
+import importlib
+import math
+import os
+import random
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+import tictactoe
+
+# UCT exploration constant
+EXPLORATION = math.sqrt(2)
+
+
+class Node():
+    """
+    Search tree node. Wins are counted for the player who moved into
+    the node: 1 for a win, 0.5 for a draw.
+    """
+
+    def __init__(self, game, board, parent=None, action=None):
+        self.board = board
+        self.parent = parent
+        self.action = action
+        self.children = []
+        self.untried = ([] if game.terminal(board)
+                        else list(game.actions(board)))
+        self.player = game.player(board)
+        self.visits = 0
+        self.wins = 0
+
+    def select(self):
+        """
+        Returns the child with the highest upper confidence bound.
+        """
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: (
+            child.wins / child.visits
+            + EXPLORATION * math.sqrt(log_visits / child.visits)
+        ))
+
+
+def reward(winner, player):
+    """
+    Returns the reward of a finished game for the player.
+    """
+    if winner is None:
+        return 0.5
+    return 1 if winner == player else 0
+
+
+def simulate(game, board, generator):
+    """
+    Plays random moves from board to the end of the game. Returns the
+    winner, or None for a draw.
+
+    Games with a position method, such as mnk.Game, play on a Position
+    whose moves update only the lines through their cell, rather than
+    copying the board and scanning every line for a winner each move.
+    """
+    if not hasattr(game, "position"):
+        while not game.terminal(board):
+            board = game.result(board,
+                                generator.choice(list(game.actions(board))))
+        utility = game.utility(board)
+        return (tictactoe.X if utility > 0
+                else tictactoe.O if utility < 0 else None)
+
+    position = game.position(board)
+    empty = [index for index, cell in enumerate(position.cells)
+             if cell is None]
+    while position.winner is None and empty:
+        choice = generator.randrange(len(empty))
+        empty[choice], empty[-1] = empty[-1], empty[choice]
+        position.make(empty.pop())
+    return position.winner
+
+
+def playout(game, node, generator):
+    """
+    Selects and expands a leaf below node, plays randomly to the end of
+    the game and backs up the result.
+    """
+    # Selection
+    while not node.untried and node.children:
+        node = node.select()
+
+    # Expansion
+    if node.untried:
+        action = node.untried.pop(generator.randrange(len(node.untried)))
+        child = Node(game, game.result(node.board, action), node, action)
+        node.children.append(child)
+        node = child
+
+    # Simulation
+    winner = simulate(game, node.board, generator)
+
+    # Backpropagation, scoring each node for the player who moved into it
+    while node is not None:
+        node.visits += 1
+        if node.parent is not None:
+            node.wins += reward(winner, node.parent.player)
+        node = node.parent
+
+
+def _resolve(game):
+    """
+    Returns a picklable stand-in for a game: modules by name.
+    """
+    if isinstance(game, types.ModuleType):
+        return game.__name__
+    return game
+
+
+def _grow(game, board, time_limit, rollouts, seed):
+    """
+    Grows one tree from board within the budget. Returns the visits and
+    wins of each root action, and the number of playouts.
+    """
+    if isinstance(game, str):
+        game = importlib.import_module(game)
+    generator = random.Random(seed)
+    root = Node(game, board)
+    deadline = (time.perf_counter() + time_limit if time_limit is not None
+                else math.inf)
+    count = 0
+    while (rollouts is None or count < rollouts) and (
+        time.perf_counter() < deadline
+    ):
+        playout(game, root, generator)
+        count += 1
+    return {child.action: (child.visits, child.wins)
+            for child in root.children}, count
+
+
+def search(board, game=tictactoe, time_limit=1.0, rollouts=None,
+           processes=1, seed=None):
+    """
+    Runs playouts until time_limit seconds pass or the rollouts budget is
+    spent, whichever comes first. Returns the most visited action (None
+    if the game is over) and search statistics, including playouts per
+    second. processes=None uses one process per CPU; each call starts its
+    own pool, so a single move is best searched in one process.
+    """
+    if time_limit is None and rollouts is None:
+        raise ValueError("need a time_limit or rollouts budget")
+    if ((time_limit is not None and time_limit <= 0)
+            or (rollouts is not None and rollouts <= 0)):
+        raise ValueError("time_limit and rollouts must be positive")
+    if game.terminal(board):
+        return None, {"playouts": 0, "seconds": 0.0,
+                      "playouts_per_second": 0.0}
+
+    processes = processes or os.cpu_count() or 1
+    seeds = [None if seed is None else seed + i for i in range(processes)]
+    shares = [None] * processes
+    if rollouts is not None:
+        shares = [rollouts // processes + (i < rollouts % processes)
+                  for i in range(processes)]
+
+    start = time.perf_counter()
+    if processes == 1:
+        results = [_grow(game, board, time_limit, shares[0], seeds[0])]
+    else:
+        with ProcessPoolExecutor(processes) as executor:
+            results = list(executor.map(
+                _grow, [_resolve(game)] * processes, [board] * processes,
+                [time_limit] * processes, shares, seeds
+            ))
+    seconds = time.perf_counter() - start
+
+    # Sum root statistics across trees
+    visits, wins = dict(), dict()
+    for statistics, _ in results:
+        for action, (count, total) in statistics.items():
+            visits[action] = visits.get(action, 0) + count
+            wins[action] = wins.get(action, 0) + total
+    playouts = sum(count for _, count in results)
+
+    action = max(visits, key=visits.get) if visits else None
+    return action, {
+        "playouts": playouts,
+        "seconds": seconds,
+        "playouts_per_second": playouts / seconds if seconds else 0.0,
+        "visits": visits,
+        "win_rate": wins[action] / visits[action] if visits else None,
+    }
+
+
+def mcts(board, game=tictactoe, time_limit=1.0, rollouts=None,
+         processes=1):
+    """
+    Returns the action chosen by Monte Carlo Tree Search for the current
+    player on the board, or None if the game is over.
+    """
+    action, _ = search(board, game, time_limit, rollouts, processes)
+    return action
+
+
+if __name__ == "__main__":
+    import mnk
+
+    for name, game in [("tictactoe", tictactoe),
+                       ("gomoku 15x15", mnk.Game(15, 15, 5))]:
+        action, statistics = search(game.initial_state(), game)
+        print(f"{name}: {action} after {statistics['playouts']} playouts, "
+              f"{statistics['playouts_per_second']:.0f} playouts/sec")
@@ -0,0 +1,336 @@
+"""
+Generalized m,n,k-game: players take turns on an m by n board, and the
+first to get k in a row horizontally, vertically or diagonally wins.
+Tic Tac Toe is the 3,3,3-game; gomoku is the 15,15,5-game.
+"""
+
+import math
+import time
+
+X = "X"
+O = "O"
+EMPTY = None
+
+# Directions a line of k cells can run in from its first cell
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+# Boards up to this many cells search every empty cell by default
+SMALL_BOARD = 25
+
+
+class Timeout(Exception):
+    pass
+
+
+class Game():
+    """
+    m,n,k-game rules with the same interface as tictactoe.py, and a
+    depth-limited search for the optimal action.
+    """
+
+    def __init__(self, m=3, n=3, k=3, radius=None):
+        if not 1 <= k <= max(m, n):
+            raise ValueError(f"cannot get {k} in a row on a {m}x{n} board")
+        self.m = m
+        self.n = n
+        self.k = k
+
+        # Search only moves this close to a piece; small boards try all
+        if radius is None:
+            radius = max(m, n) if m * n <= SMALL_BOARD else 1
+        self.radius = radius
+
+        # Every line of k cells, and the lines through each cell
+        self.lines = []
+        self.lines_through = [[] for _ in range(m * n)]
+        for i in range(m):
+            for j in range(n):
+                for di, dj in DIRECTIONS:
+                    end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                    if 0 <= end_i < m and 0 <= end_j < n:
+                        line = [(i + di * step) * n + (j + dj * step)
+                                for step in range(k)]
+                        for index in line:
+                            self.lines_through[index].append(len(self.lines))
+                        self.lines.append(line)
+
+        # Score of a line holding c pieces of one player only
+        self.weights = [0] + [10 ** c for c in range(1, k)]
+        self.win = 10 ** (k + 2)
+
+    def initial_state(self):
+        """
+        Returns starting state of the board.
+        """
+        return [[EMPTY] * self.n for _ in range(self.m)]
+
+    def player(self, board):
+        """
+        Returns player who has the next turn on a board.
+        """
+        x_count = sum(row.count(X) for row in board)
+        o_count = sum(row.count(O) for row in board)
+        return X if x_count <= o_count else O
+
+    def actions(self, board):
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        return {(i, j) for i in range(self.m) for j in range(self.n)
+                if board[i][j] == EMPTY}
+
+    def result(self, board, action):
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if board[i][j] != EMPTY:
+            raise ValueError("cell already taken")
+        new_board = [row.copy() for row in board]
+        new_board[i][j] = self.player(board)
+        return new_board
+
+    def winner(self, board):
+        """
+        Returns the winner of the game, if there is one.
+        """
+        for line in self.lines:
+            first = board[line[0] // self.n][line[0] % self.n]
+            if first != EMPTY and all(
+                board[index // self.n][index % self.n] == first
+                for index in line
+            ):
+                return first
+        return None
+
+    def terminal(self, board):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return (self.winner(board) is not None
+                or all(cell != EMPTY for row in board for cell in row))
+
+    def utility(self, board):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        winner = self.winner(board)
+        return 1 if winner == X else -1 if winner == O else 0
+
+    def position(self, board):
+        """
+        Returns a Position of the board for incremental play.
+        """
+        return Position(self, board)
+
+    def minimax(self, board, time_limit=1.0, max_depth=None):
+        """
+        Returns the best action for the current player found within
+        time_limit seconds, or None if the game is over.
+        """
+        action, _, _ = self.search(board, time_limit, max_depth)
+        return action
+
+    def search(self, board, time_limit=1.0, max_depth=None):
+        """
+        Runs iterative deepening alpha-beta search until time_limit
+        seconds pass, max_depth is reached or the result is proven.
+        Returns the best action, its value for the current player and
+        the deepest depth completed.
+        """
+        position = Position(self, board)
+        if position.winner is not None or position.empty == 0:
+            return None, 0, 0
+
+        deadline = time.perf_counter() + time_limit
+        max_depth = min(max_depth or position.empty, position.empty)
+        search = Search(position, deadline)
+        best_action, best_value, depth = None, 0, 0
+
+        for depth in range(1, max_depth + 1):
+            try:
+                action, value = search.root(depth, best_action)
+            except Timeout:
+                depth -= 1
+                break
+            best_action, best_value = action, value
+
+            # Stop once a win or loss is proven
+            if abs(best_value) >= self.win - self.m * self.n:
+                break
+
+        # Fall back to the most promising move if no depth completed
+        if best_action is None:
+            best_action = position.candidates()[0]
+        return divmod(best_action, self.n), best_value, depth
+
+
+class Position():
+    """
+    Mutable search state with incremental updates: every move touches
+    only the lines through its cell, updating their piece counts, the
+    heuristic score and win detection.
+    """
+
+    def __init__(self, game, board):
+        self.game = game
+        self.cells = [EMPTY] * (game.m * game.n)
+        self.x_counts = [0] * len(game.lines)
+        self.o_counts = [0] * len(game.lines)
+        self.score = 0
+        self.winner = None
+        self.empty = game.m * game.n
+        self.history = []
+
+        # Replay the board's pieces, keeping the side to move
+        x_cells, o_cells = [], []
+        for i in range(game.m):
+            for j in range(game.n):
+                if board[i][j] == X:
+                    x_cells.append(i * game.n + j)
+                elif board[i][j] == O:
+                    o_cells.append(i * game.n + j)
+        for index in x_cells:
+            self.place(index, X)
+        for index in o_cells:
+            self.place(index, O)
+        self.turn = X if len(x_cells) <= len(o_cells) else O
+
+    def line_score(self, line):
+        """
+        Returns a line's heuristic score for X.
+        """
+        x, o = self.x_counts[line], self.o_counts[line]
+        if x and not o:
+            return self.game.weights[min(x, self.game.k - 1)]
+        if o and not x:
+            return -self.game.weights[min(o, self.game.k - 1)]
+        return 0
+
+    def place(self, index, player):
+        self.history.append((index, self.winner))
+        self.cells[index] = player
+        self.empty -= 1
+        counts = self.x_counts if player == X else self.o_counts
+        for line in self.game.lines_through[index]:
+            self.score -= self.line_score(line)
+            counts[line] += 1
+            self.score += self.line_score(line)
+            if counts[line] == self.game.k and self.winner is None:
+                self.winner = player
+
+    def make(self, index):
+        """
+        Places the current player's piece on the cell at index.
+        """
+        self.place(index, self.turn)
+        self.turn = O if self.turn == X else X
+
+    def undo(self):
+        """
+        Takes back the last move.
+        """
+        index, self.winner = self.history.pop()
+        player = self.cells[index]
+        counts = self.x_counts if player == X else self.o_counts
+        for line in self.game.lines_through[index]:
+            self.score -= self.line_score(line)
+            counts[line] -= 1
+            self.score += self.line_score(line)
+        self.cells[index] = EMPTY
+        self.empty += 1
+        self.turn = player
+
+    def candidates(self, hint=None):
+        """
+        Returns empty cells within the game's radius of a piece (or the
+        center on an empty board), hottest first: cells on lines with
+        more pieces of a single player come first.
+        """
+        game = self.game
+        if self.empty == len(self.cells):
+            return [(game.m // 2) * game.n + game.n // 2]
+
+        heat = dict()
+        radius = game.radius
+        for index, cell in enumerate(self.cells):
+            if cell == EMPTY:
+                continue
+            i, j = divmod(index, game.n)
+            for ni in range(max(0, i - radius), min(game.m, i + radius + 1)):
+                for nj in range(max(0, j - radius),
+                                min(game.n, j + radius + 1)):
+                    neighbor = ni * game.n + nj
+                    if self.cells[neighbor] == EMPTY and neighbor not in heat:
+                        heat[neighbor] = sum(
+                            abs(self.line_score(line))
+                            for line in game.lines_through[neighbor]
+                        )
+        moves = sorted(heat, key=heat.get, reverse=True)
+        if hint in heat:
+            moves.remove(hint)
+            moves.insert(0, hint)
+        return moves
+
+
+class Search():
+    """
+    Negamax alpha-beta search of a position with a deadline.
+    """
+
+    def __init__(self, position, deadline):
+        self.position = position
+        self.deadline = deadline
+        self.nodes = 0
+
+    def root(self, depth, hint):
+        """
+        Searches every move to depth, returning the best move and value.
+        """
+        position = self.position
+        alpha, beta = -math.inf, math.inf
+        best_move = None
+        for move in position.candidates(hint):
+            position.make(move)
+            try:
+                value = -self.negamax(depth - 1, -beta, -alpha, 1)
+            finally:
+                position.undo()
+            if best_move is None or value > alpha:
+                alpha = value
+                best_move = move
+        return best_move, alpha
+
+    def negamax(self, depth, alpha, beta, ply):
+        """
+        Returns the value of the position for the player to move.
+        """
+        self.nodes += 1
+        if not self.nodes % 1024 and time.perf_counter() > self.deadline:
+            raise Timeout
+
+        position = self.position
+        game = position.game
+
+        # The player who just moved won; prefer quicker wins
+        if position.winner is not None:
+            return -(game.win - ply)
+        if position.empty == 0:
+            return 0
+        if depth == 0:
+            return position.score if position.turn == X else -position.score
+
+        best = -math.inf
+        for move in position.candidates():
+            position.make(move)
+            try:
+                value = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                position.undo()
+            if value > best:
+                best = value
+                if best > alpha:
+                    alpha = best
+                    if alpha >= beta:
+                        break
+        return best
@@ -1,146 +1,185 @@
 import pygame
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import tictactoe as ttt
 
 pygame.init()
 size = width, height = 600, 400
 
+# Frame rate cap; the screen is only redrawn when something changes
+fps = 30
+
+# Least time the computer appears to think, in seconds
+aiDelay = 0.5
+
 # Colors
 black = (0, 0, 0)
 white = (255, 255, 255)
 
 screen = pygame.display.set_mode(size)
+clock = pygame.time.Clock()
 
 mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
 moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
 
+# Buttons and board tiles
+playXButton = pygame.Rect((width / 8), (height / 2), width / 4, 50)
+playOButton = pygame.Rect(5 * (width / 8), (height / 2), width / 4, 50)
+againButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
+titleArea = pygame.Rect(0, 0, width, 60)
+
+tile_size = 80
+tile_origin = (width / 2 - (1.5 * tile_size),
+               height / 2 - (1.5 * tile_size))
+tiles = [[pygame.Rect(tile_origin[0] + j * tile_size,
+                      tile_origin[1] + i * tile_size,
+                      tile_size, tile_size)
+          for j in range(3)]
+         for i in range(3)]
+
+# The computer searches on a worker thread, polled every frame
+executor = ThreadPoolExecutor(max_workers=1)
+aiSearch = None
+aiReady = 0
+
 user = None
 board = ttt.initial_state()
-ai_turn = False
 
+
+def draw_button(button, text):
+    pygame.draw.rect(screen, white, button)
+    label = mediumFont.render(text, True, black)
+    labelRect = label.get_rect()
+    labelRect.center = button.center
+    screen.blit(label, labelRect)
+    return button
+
+
+def draw_title(text):
+    screen.fill(black, titleArea)
+    title = largeFont.render(text, True, white)
+    titleRect = title.get_rect()
+    titleRect.center = ((width / 2), 30)
+    screen.blit(title, titleRect)
+    return titleArea
+
+
+def draw_tile(i, j):
+    rect = tiles[i][j]
+    screen.fill(black, rect)
+    pygame.draw.rect(screen, white, rect, 3)
+    if board[i][j] != ttt.EMPTY:
+        move = moveFont.render(board[i][j], True, white)
+        moveRect = move.get_rect()
+        moveRect.center = rect.center
+        screen.blit(move, moveRect)
+    return rect
+
+
+def game_title():
+    if ttt.terminal(board):
+        winner = ttt.winner(board)
+        if winner is None:
+            return f"Game Over: Tie."
+        return f"Game Over: {winner} wins."
+    if user == ttt.player(board):
+        return f"Play as {user}"
+    return f"Computer thinking..."
+
+
+def draw_menu():
+    screen.fill(black)
+    title = largeFont.render("Play Tic-Tac-Toe", True, white)
+    titleRect = title.get_rect()
+    titleRect.center = ((width / 2), 50)
+    screen.blit(title, titleRect)
+    draw_button(playXButton, "Play as X")
+    draw_button(playOButton, "Play as O")
+
+
+def draw_game():
+    screen.fill(black)
+    draw_title(game_title())
+    for i in range(3):
+        for j in range(3):
+            draw_tile(i, j)
+    if ttt.terminal(board):
+        draw_button(againButton, "Play Again")
+
+
+def draw_move(action):
+    """
+    Redraws only what a move changes, returning the dirty rects.
+    """
+    dirty = [draw_title(game_title()), draw_tile(*action)]
+    if ttt.terminal(board):
+        dirty.append(draw_button(againButton, "Play Again"))
+    return dirty
+
+
+redraw = True
 while True:
 
+    # Collect clicks from events, so nothing is missed between frames
+    click = None
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             sys.exit()
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            click = event.pos
 
-    screen.fill(black)
+    dirty = []
 
     # Let user choose a player.
     if user is None:
-
-        # Draw title
-        title = largeFont.render("Play Tic-Tac-Toe", True, white)
-        titleRect = title.get_rect()
-        titleRect.center = ((width / 2), 50)
-        screen.blit(title, titleRect)
-
-        # Draw buttons
-        playXButton = pygame.Rect((width / 8), (height / 2), width / 4, 50)
-        playX = mediumFont.render("Play as X", True, black)
-        playXRect = playX.get_rect()
-        playXRect.center = playXButton.center
-        pygame.draw.rect(screen, white, playXButton)
-        screen.blit(playX, playXRect)
-
-        playOButton = pygame.Rect(5 * (width / 8), (height / 2), width / 4, 50)
-        playO = mediumFont.render("Play as O", True, black)
-        playORect = playO.get_rect()
-        playORect.center = playOButton.center
-        pygame.draw.rect(screen, white, playOButton)
-        screen.blit(playO, playORect)
-
-        # Check if button is clicked
-        click, _, _ = pygame.mouse.get_pressed()
-        if click == 1:
-            mouse = pygame.mouse.get_pos()
-            if playXButton.collidepoint(mouse):
-                time.sleep(0.2)
+        if click is not None:
+            if playXButton.collidepoint(click):
                 user = ttt.X
-            elif playOButton.collidepoint(mouse):
-                time.sleep(0.2)
+                redraw = True
+            elif playOButton.collidepoint(click):
                 user = ttt.O
+                redraw = True
 
     else:
-
-        # Draw game board
-        tile_size = 80
-        tile_origin = (width / 2 - (1.5 * tile_size),
-                       height / 2 - (1.5 * tile_size))
-        tiles = []
-        for i in range(3):
-            row = []
-            for j in range(3):
-                rect = pygame.Rect(
-                    tile_origin[0] + j * tile_size,
-                    tile_origin[1] + i * tile_size,
-                    tile_size, tile_size
-                )
-                pygame.draw.rect(screen, white, rect, 3)
-
-                if board[i][j] != ttt.EMPTY:
-                    move = moveFont.render(board[i][j], True, white)
-                    moveRect = move.get_rect()
-                    moveRect.center = rect.center
-                    screen.blit(move, moveRect)
-                row.append(rect)
-            tiles.append(row)
-
         game_over = ttt.terminal(board)
         player = ttt.player(board)
 
-        # Show title
-        if game_over:
-            winner = ttt.winner(board)
-            if winner is None:
-                title = f"Game Over: Tie."
-            else:
-                title = f"Game Over: {winner} wins."
-        elif user == player:
-            title = f"Play as {user}"
-        else:
-            title = f"Computer thinking..."
-        title = largeFont.render(title, True, white)
-        titleRect = title.get_rect()
-        titleRect.center = ((width / 2), 30)
-        screen.blit(title, titleRect)
-
-        # Check for AI move
+        # Start the AI search, and make its move once it is done
         if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
+            if aiSearch is None:
+                aiSearch = executor.submit(ttt.minimax, board)
+                aiReady = time.time() + aiDelay
+            elif aiSearch.done() and time.time() >= aiReady:
+                move = aiSearch.result()
+                aiSearch = None
                 board = ttt.result(board, move)
-                ai_turn = False
-            else:
-                ai_turn = True
+                dirty = draw_move(move)
 
         # Check for a user move
-        click, _, _ = pygame.mouse.get_pressed()
-        if click == 1 and user == player and not game_over:
-            mouse = pygame.mouse.get_pos()
+        elif click is not None and user == player and not game_over:
             for i in range(3):
                 for j in range(3):
-                    if (board[i][j] == ttt.EMPTY and tiles[i][j].collidepoint(mouse)):
+                    if (board[i][j] == ttt.EMPTY and tiles[i][j].collidepoint(click)):
                         board = ttt.result(board, (i, j))
+                        dirty = draw_move((i, j))
+
+        elif click is not None and game_over:
+            if againButton.collidepoint(click):
+                user = None
+                board = ttt.initial_state()
+                redraw = True
+
+    if redraw:
+        if user is None:
+            draw_menu()
+        else:
+            draw_game()
+        pygame.display.flip()
+        redraw = False
+    elif dirty:
+        pygame.display.update(dirty)
 
-        if game_over:
-            againButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
-            again = mediumFont.render("Play Again", True, black)
-            againRect = again.get_rect()
-            againRect.center = againButton.center
-            pygame.draw.rect(screen, white, againButton)
-            screen.blit(again, againRect)
-            click, _, _ = pygame.mouse.get_pressed()
-            if click == 1:
-                mouse = pygame.mouse.get_pos()
-                if againButton.collidepoint(mouse):
-                    time.sleep(0.2)
-                    user = None
-                    board = ttt.initial_state()
-                    ai_turn = False
-
-    pygame.display.flip()
+    clock.tick(fps)
@@ -0,0 +1,163 @@
+"""
+Plays tictactoe games between two agents without the pygame UI, and
+reports throughput: games per second, nodes searched per second and
+per-move latency percentiles.
+
+Usage: python selfplay.py [--x alphabeta] [--o random] [--games 100]
+
+Agents:
+    minimax     exhaustive minimax, without pruning or caching
+    alphabeta   alpha-beta search with a cleared transposition table
+    table       opening book lookup
+    random      uniformly random move
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import benchmark
+import bitboard
+import book
+import tictactoe as ttt
+
+
+def minimax(board, generator):
+    return benchmark.plain_minimax(board)
+
+
+def alpha_beta(board, generator):
+    ttt.clear_cache()
+    x, o = bitboard.from_board(board)
+    if bitboard.player(x, o) == ttt.X:
+        _, move = ttt.max_value(x, o)
+    else:
+        _, move = ttt.min_value(x, o)
+    return bitboard.cell(move), ttt.cache_info()["nodes"]
+
+
+def table(board, generator):
+    _, move = book.lookup(ttt.BOOK, *bitboard.from_board(board))
+    return bitboard.cell(move), 0
+
+
+def random_move(board, generator):
+    return generator.choice(sorted(ttt.actions(board))), 0
+
+
+AGENTS = {
+    "minimax": minimax,
+    "alphabeta": alpha_beta,
+    "table": table,
+    "random": random_move,
+}
+
+
+def play(x_agent, o_agent, seed):
+    """
+    Plays one game. Returns the winner, and each player's per-move
+    latencies in seconds and nodes searched.
+    """
+    generator = random.Random(seed)
+    agents = {ttt.X: AGENTS[x_agent], ttt.O: AGENTS[o_agent]}
+    latencies = {ttt.X: [], ttt.O: []}
+    nodes = {ttt.X: 0, ttt.O: 0}
+
+    board = ttt.initial_state()
+    while not ttt.terminal(board):
+        player = ttt.player(board)
+        start = time.perf_counter()
+        action, searched = agents[player](board, generator)
+        latencies[player].append(time.perf_counter() - start)
+        nodes[player] += searched
+        board = ttt.result(board, action)
+    return ttt.winner(board), latencies, nodes
+
+
+def percentile(values, q):
+    """
+    Returns the q-th percentile of sorted values, by nearest rank.
+    """
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def run(x_agent, o_agent, games, processes, seed):
+    start = time.perf_counter()
+    seeds = [seed + game for game in range(games)]
+    if processes == 1:
+        results = [play(x_agent, o_agent, s) for s in seeds]
+    else:
+        with ProcessPoolExecutor(processes) as executor:
+            results = list(executor.map(
+                play, [x_agent] * games, [o_agent] * games, seeds,
+                chunksize=max(1, games // (4 * processes))
+            ))
+    seconds = time.perf_counter() - start
+
+    report = {
+        "games": games,
+        "processes": processes,
+        "seconds": seconds,
+        "games_per_second": games / seconds,
+        "outcomes": {"X": 0, "O": 0, "tie": 0},
+        "players": {},
+    }
+    for winner, _, _ in results:
+        report["outcomes"][winner or "tie"] += 1
+
+    for player, agent in [(ttt.X, x_agent), (ttt.O, o_agent)]:
+        latencies = sorted(latency for _, moves, _ in results
+                           for latency in moves[player])
+        nodes = sum(searched[player] for _, _, searched in results)
+        thinking = sum(latencies)
+        report["players"][player] = {
+            "agent": agent,
+            "moves": len(latencies),
+            "nodes": nodes,
+            "nodes_per_second": nodes / thinking if thinking else 0.0,
+            "latency_ms": {f"p{q}": percentile(latencies, q) * 1000
+                           for q in (50, 90, 99)},
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--x", choices=AGENTS, default="alphabeta",
+                        help="agent playing X")
+    parser.add_argument("--o", choices=AGENTS, default="random",
+                        help="agent playing O")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args.x, args.o, args.games, args.processes, args.seed)
+
+    outcomes = report["outcomes"]
+    print(f"{report['games']} games in {report['seconds']:.2f}s "
+          f"({report['games_per_second']:.1f} games/sec), "
+          f"X {outcomes['X']} / O {outcomes['O']} / tie {outcomes['tie']}",
+          file=sys.stderr)
+    for player, stats in report["players"].items():
+        latency = stats["latency_ms"]
+        print(f"{player} {stats['agent']:>10}: "
+              f"{stats['nodes_per_second']:10.0f} nodes/sec, latency "
+              f"p50 {latency['p50']:.3f}ms p90 {latency['p90']:.3f}ms "
+              f"p99 {latency['p99']:.3f}ms", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,32 @@ Tic Tac Toe Player
 
 import math
 
+import bitboard
+import book
+
 X = "X"
 O = "O"
 EMPTY = None
 
+# Best possible utility for X
+WIN = 1
+
+# Center first, then corners, then edges
+MOVE_ORDER = [(1, 1), (0, 0), (0, 2), (2, 0), (2, 2),
+              (0, 1), (1, 0), (1, 2), (2, 1)]
+MOVE_BITS = [bitboard.bit(action) for action in MOVE_ORDER]
+
+# Transposition table: bitboard key -> (value, bound, best move bit).
+# Kept across moves and games, since a position's value never changes.
+EXACT, LOWER, UPPER = "exact", "lower", "upper"
+transpositions = dict()
+cache_hits = 0
+cache_misses = 0
+nodes_searched = 0
+
+# Solved positions up to symmetry, built by book.py
+BOOK = book.load()
+
 
 def initial_state():
     """
@@ -22,140 +44,193 @@ def player(board):
     """
     Returns player who has the next turn on a board.
     """
+    return bitboard.player(*bitboard.from_board(board))
 
-    x_count = 0
-    o_count = 0
-    for row in board:
-        for cell in row:
-            if cell == X:
-                x_count += 1
-            if cell == O:
-                o_count += 1
-
-    if(x_count <= o_count):
-        return X
-    else:
-        return O
-    
 
 def actions(board):
     """
     Returns set of all possible actions (i, j) available on the board.
     """
-    actions_set = set()
-    for i in range(3):
-        for j in range(3):
-            if board[i][j] == EMPTY:
-                actions_set.add((i, j))
+    return {bitboard.cell(move)
+            for move in bitboard.actions(*bitboard.from_board(board))}
 
-    return actions_set
 
 def result(board, action):
     """
     Returns the board that results from making move (i, j) on the board.
     """
-    new_board = [[EMPTY, EMPTY, EMPTY],[EMPTY, EMPTY, EMPTY],[EMPTY, EMPTY, EMPTY]]
-
     if(action == None or action[0] == None or action[1] == None):
         raise Exception("Action none")
-                        
-    for i in range(3):
-        for j in range(3):
-            new_board[i][j] = board[i][j]
-    
-    new_board[action[0]][action[1]] = player(new_board)
 
-    return new_board
+    x, o = bitboard.from_board(board)
+    return bitboard.to_board(*bitboard.result(x, o, bitboard.bit(action)))
+
 
 def winner(board):
     """
     Returns the winner of the game, if there is one.
     """
-
-    for i in range(3):
-        if board[i][0] == board[i][1] == board[i][2] != EMPTY:
-            return board[i][0]
-        if board[0][i] == board[1][i] == board[2][i] != EMPTY:
-            return board[0][i]
-        
-    if board[0][0] == board[1][1] == board[2][2] != EMPTY:
-        return board[0][0]
-    
-    if board[0][2] == board[1][1] == board[2][0] != EMPTY:
-        return board[0][2]
-    
-    return None
+    return bitboard.winner(*bitboard.from_board(board))
 
 
 def terminal(board):
     """
     Returns True if game is over, False otherwise.
     """
-    if( winner(board) != None):
-        return True
-    
-    else :
-        for i in range(3):
-            for j in range(3):
-                if board[i][j] == EMPTY:
-                    return False
-        return True
+    return bitboard.terminal(*bitboard.from_board(board))
+
 
 def utility(board):
     """
     Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
     """
-    if(terminal(board)):
-        if(winner(board) == X):
-            return 1
-        elif(winner(board) == O):
-            return -1
-        else:
-            return 0
+    x, o = bitboard.from_board(board)
+    if bitboard.terminal(x, o):
+        return bitboard.utility(x, o)
+
+
+def board_key(board):
+    """
+    Returns the bitboard encoding of the board, used as the
+    transposition table key.
+    """
+    return bitboard.key(*bitboard.from_board(board))
+
+
+def cache_info():
+    """
+    Returns the transposition table's hits, misses, size and hit rate,
+    and the number of nodes searched.
+    """
+    lookups = cache_hits + cache_misses
+    return {
+        "hits": cache_hits,
+        "misses": cache_misses,
+        "size": len(transpositions),
+        "hit_rate": cache_hits / lookups if lookups else 0.0,
+        "nodes": nodes_searched
+    }
+
+
+def clear_cache():
+    """
+    Empties the transposition table and resets its counters.
+    """
+    global cache_hits, cache_misses, nodes_searched
+    transpositions.clear()
+    cache_hits = 0
+    cache_misses = 0
+    nodes_searched = 0
 
 
 def minimax(board):
     """
     Returns the optimal action for the current player on the board.
     """
-    if terminal(board):
+    x, o = bitboard.from_board(board)
+    if bitboard.terminal(x, o):
         return None
 
-    current_player = player(board)
-    
-    if current_player == X:
-        _, action = max_value(board)
+    entry = book.lookup(BOOK, x, o)
+    if entry is not None:
+        return bitboard.cell(entry[1])
+
+    if bitboard.player(x, o) == X:
+        _, move = max_value(x, o)
     else:
-        _, action = min_value(board)
-    
-    return action
+        _, move = min_value(x, o)
+
+    return bitboard.cell(move)
+
+def lookup(x, o, alpha, beta, search):
+    """
+    Returns the value and best move for state (x, o), searching it
+    with the alpha-beta window on a miss and storing the result.
+
+    Values found outside the window are only bounds, so each entry
+    records whether its value is exact, a lower bound or an upper bound.
+    """
+    global cache_hits, cache_misses
+    key = bitboard.key(x, o)
+    entry = transpositions.get(key)
+    hint = None
+    if entry is not None:
+        value, bound, hint = entry
+        if (bound == EXACT
+                or (bound == LOWER and value >= beta)
+                or (bound == UPPER and value <= alpha)):
+            cache_hits += 1
+            return value, hint
+
+    cache_misses += 1
+    value, move = search(x, o, alpha, beta, hint)
+    if value <= alpha:
+        bound = UPPER
+    elif value >= beta:
+        bound = LOWER
+    else:
+        bound = EXACT
+    transpositions[key] = value, bound, move
+    return value, move
+
+def ordered_moves(x, o, hint=None):
+    """
+    Returns free cells as move bits, ordered to cause alpha-beta cutoffs
+    early: the best move found before, then center, corners and edges.
+    """
+    taken = x | o
+    moves = [move for move in MOVE_BITS if not taken & move]
+    if hint in moves:
+        moves.remove(hint)
+        moves.insert(0, hint)
+    return moves
 
-def max_value(board):
-    if terminal(board):
-        return utility(board), None
+def max_value(x, o, alpha=-math.inf, beta=math.inf):
+    return lookup(x, o, alpha, beta, search_max)
+
+def min_value(x, o, alpha=-math.inf, beta=math.inf):
+    return lookup(x, o, alpha, beta, search_min)
+
+def search_max(x, o, alpha, beta, hint):
+    global nodes_searched
+    nodes_searched += 1
+    if bitboard.terminal(x, o):
+        return bitboard.utility(x, o), None
 
     v = -math.inf
-    best_action = None
+    best_move = None
 
-    for action in actions(board):
-        value, _ = min_value(result(board, action))
+    for move in ordered_moves(x, o, hint):
+        value, _ = min_value(x | move, o, alpha, beta)
         if value > v:
             v = value
-            best_action = action
+            best_move = move
 
-    return v, best_action
+        # Stop on a forced win or when min will avoid this branch
+        if v >= WIN or v >= beta:
+            break
+        alpha = max(alpha, v)
 
-def min_value(board):
-    if terminal(board):
-        return utility(board), None
+    return v, best_move
+
+def search_min(x, o, alpha, beta, hint):
+    global nodes_searched
+    nodes_searched += 1
+    if bitboard.terminal(x, o):
+        return bitboard.utility(x, o), None
 
     v = math.inf
-    best_action = None
+    best_move = None
 
-    for action in actions(board):
-        value, _ = max_value(result(board, action))
+    for move in ordered_moves(x, o, hint):
+        value, _ = max_value(x, o | move, alpha, beta)
         if value < v:
             v = value
-            best_action = action
+            best_move = move
+
+        # Stop on a forced win or when max will avoid this branch
+        if v <= -WIN or v <= alpha:
+            break
+        beta = min(beta, v)
 
-    return v, best_action
\ No newline at end of file
+    return v, best_move
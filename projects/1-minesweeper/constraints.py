@@ -0,0 +1,415 @@
+"""
+Constraint solving for Minesweeper knowledge.
+
+A sentence (cells, count) is a linear equation over 0/1 variables: the
+number of its cells that are mines. Sentences sharing cells, directly or
+through other sentences, form a component; components are independent,
+so each one is solved on its own.
+"""
+
+import math
+import random
+
+# Components up to this many cells are solved exactly by enumeration
+MAX_ENUMERATED_CELLS = 24
+
+# Solutions sampled from larger components to estimate probabilities
+SAMPLES = 100
+
+
+def components(sentences):
+    """
+    Returns the sentences grouped into lists of connected sentences.
+    """
+    parent = dict()
+
+    def find(cell):
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    # Union the cells of every sentence
+    for cells, _ in sentences:
+        first = None
+        for cell in cells:
+            parent.setdefault(cell, cell)
+            if first is None:
+                first = find(cell)
+            else:
+                parent[find(cell)] = first
+
+    groups = dict()
+    for sentence in sentences:
+        cells, _ = sentence
+        if cells:
+            groups.setdefault(find(next(iter(cells))), []).append(sentence)
+    return list(groups.values())
+
+
+def eliminate(sentences, cells):
+    """
+    Row reduces the sentences' equations with fraction-free Gauss-Jordan
+    elimination over the integers, then bounds every reduced equation.
+    If a row can only be met with all positive coefficients at 1 and
+    all negative ones at 0 (or the reverse), those cells are forced.
+    Returns the sets of cells found to be mines and safe.
+    """
+    index = {cell: i for i, cell in enumerate(cells)}
+    rows = []
+    for sentence_cells, count in sentences:
+        row = [0] * (len(cells) + 1)
+        for cell in sentence_cells:
+            row[index[cell]] = 1
+        row[-1] = count
+        rows.append(row)
+
+    pivot_row = 0
+    for column in range(len(cells)):
+        pivot = next((r for r in range(pivot_row, len(rows))
+                      if rows[r][column]), None)
+        if pivot is None:
+            continue
+        rows[pivot_row], rows[pivot] = rows[pivot], rows[pivot_row]
+        pivot_values = rows[pivot_row]
+        for r, row in enumerate(rows):
+            factor = row[column]
+            if r == pivot_row or not factor:
+                continue
+            row = [pivot_values[column] * a - factor * b
+                   for a, b in zip(row, pivot_values)]
+            divisor = math.gcd(*row)
+            rows[r] = [a // divisor for a in row] if divisor > 1 else row
+        pivot_row += 1
+
+    mines, safes = set(), set()
+    for row in rows:
+        *coefficients, total = row
+        highest = sum(a for a in coefficients if a > 0)
+        lowest = sum(a for a in coefficients if a < 0)
+        if total == highest:
+            positive, negative = mines, safes
+        elif total == lowest:
+            positive, negative = safes, mines
+        else:
+            continue
+        for cell, a in zip(cells, coefficients):
+            if a > 0:
+                positive.add(cell)
+            elif a < 0:
+                negative.add(cell)
+    return mines, safes
+
+
+def solutions(sentences, cells, generator=None):
+    """
+    Yields every assignment of mines to cells that satisfies all the
+    sentences, as a tuple of 0 or 1 per cell, by backtracking. Given a
+    random generator, each cell tries its two values in random order.
+    """
+    index = {cell: i for i, cell in enumerate(cells)}
+    needed = [count for _, count in sentences]
+    unassigned = [len(sentence_cells) for sentence_cells, _ in sentences]
+    touching = [[] for _ in cells]
+    for s, (sentence_cells, _) in enumerate(sentences):
+        for cell in sentence_cells:
+            touching[index[cell]].append(s)
+    if any(n < 0 or n > u for n, u in zip(needed, unassigned)):
+        return
+
+    assignment = [0] * len(cells)
+
+    def assign(i):
+        if i == len(cells):
+            yield tuple(assignment)
+            return
+        values = (0, 1)
+        if generator is not None and generator.random() < 0.5:
+            values = (1, 0)
+        for value in values:
+            consistent = True
+            for s in touching[i]:
+                needed[s] -= value
+                unassigned[s] -= 1
+                if needed[s] < 0 or needed[s] > unassigned[s]:
+                    consistent = False
+            if consistent:
+                assignment[i] = value
+                yield from assign(i + 1)
+            for s in touching[i]:
+                needed[s] += value
+                unassigned[s] += 1
+
+    yield from assign(0)
+
+
+def sample_solutions(sentences, cells, samples, generator=random):
+    """
+    Returns samples solutions of the sentences, as in solutions, drawn
+    uniformly at random. The completions of every partial assignment,
+    keyed by the next cell and the mines each sentence still needs, are
+    counted from the last cell back to the first, and each cell takes a
+    value with probability proportional to its number of completions.
+    """
+    if any(count < 0 or count > len(sentence_cells)
+           for sentence_cells, count in sentences):
+        return []
+    index = {cell: i for i, cell in enumerate(cells)}
+    touching = [[] for _ in cells]
+    for s, (sentence_cells, _) in enumerate(sentences):
+        for cell in sentence_cells:
+            touching[index[cell]].append(s)
+
+    # Each sentence on a cell, with how many of its cells come after it
+    seen = [0] * len(sentences)
+    later = [[] for _ in cells]
+    for i in range(len(cells)):
+        for s in touching[i]:
+            seen[s] += 1
+            later[i].append((s, len(sentences[s][0]) - seen[s]))
+
+    def assign(i, needed, value):
+        needed = list(needed)
+        for s, left in later[i]:
+            needed[s] -= value
+            if needed[s] < 0 or needed[s] > left:
+                return None
+        return tuple(needed)
+
+    # The mines still needed by the sentences before each cell, then
+    # the completions of each, layer by layer without recursion
+    root = tuple(count for _, count in sentences)
+    layers = [{root}]
+    for i in range(len(cells)):
+        layers.append({assign(i, needed, value)
+                       for needed in layers[i] for value in (0, 1)}
+                      - {None})
+    completed = [dict() for _ in layers]
+    completed[-1] = dict.fromkeys(layers[-1], 1)
+    for i in range(len(cells) - 1, -1, -1):
+        for needed in layers[i]:
+            completed[i][needed] = sum(
+                completed[i + 1].get(assign(i, needed, value), 0)
+                for value in (0, 1)
+            )
+    if not completed[0][root]:
+        return []
+
+    found = []
+    for _ in range(samples):
+        needed = root
+        assignment = []
+        for i in range(len(cells)):
+            safe, mine = assign(i, needed, 0), assign(i, needed, 1)
+            ways = completed[i + 1].get(safe, 0)
+            value = int(generator.randrange(
+                ways + completed[i + 1].get(mine, 0)
+            ) >= ways)
+            needed = mine if value else safe
+            assignment.append(value)
+        found.append(tuple(assignment))
+    return found
+
+
+def ordered_cells(sentences):
+    """
+    Returns the sentences' cells ordered sentence by sentence, so that
+    backtracking completes sentences, and prunes, early.
+    """
+    cells = dict()
+    for sentence_cells, _ in sentences:
+        for cell in sorted(sentence_cells):
+            cells.setdefault(cell)
+    return list(cells)
+
+
+def enumerate_forced(sentences, cells):
+    """
+    Returns the sets of cells that are mines, and that are safe, in
+    every solution of the sentences.
+    """
+    always = [1] * len(cells)
+    ever = [0] * len(cells)
+    found = False
+    for solution in solutions(sentences, cells):
+        found = True
+        always = [a & v for a, v in zip(always, solution)]
+        ever = [e | v for e, v in zip(ever, solution)]
+    if not found:
+        return set(), set()
+    mines = {cell for cell, a in zip(cells, always) if a}
+    safes = {cell for cell, e in zip(cells, ever) if not e}
+    return mines, safes
+
+
+def component_key(component):
+    """
+    Returns a hashable key for a component's sentences.
+    """
+    return frozenset((frozenset(cells), count) for cells, count in component)
+
+
+def solve(sentences, cache=None):
+    """
+    Returns the sets of cells that must be mines, and must be safe,
+    given (cells, count) sentences. Each component is row reduced, and
+    components small enough that elimination found nothing in are
+    enumerated exactly.
+
+    If given, cache maps components to their results from earlier
+    calls, so only components that changed since are solved again. It
+    is pruned to the current components.
+    """
+    mines, safes = set(), set()
+    seen = set()
+    for component in components(sentences):
+        key = component_key(component)
+        seen.add(key)
+        if cache is not None and key in cache:
+            component_mines, component_safes = cache[key]
+        else:
+            cells = ordered_cells(component)
+            component_mines, component_safes = eliminate(component, cells)
+            if (not component_mines and not component_safes
+                    and len(cells) <= MAX_ENUMERATED_CELLS):
+                component_mines, component_safes = enumerate_forced(
+                    component, cells
+                )
+            if cache is not None:
+                cache[key] = component_mines, component_safes
+        mines |= component_mines
+        safes |= component_safes
+
+    if cache is not None:
+        for key in cache.keys() - seen:
+            del cache[key]
+    return mines, safes
+
+
+def distribution(component, cells, generator=random):
+    """
+    Returns, for each number of mines k, the number of the component's
+    solutions with k mines and how many of those have a mine in each
+    cell. Components above MAX_ENUMERATED_CELLS are estimated from
+    SAMPLES uniformly sampled solutions instead, which only keeps the
+    counts' proportions.
+    """
+    if len(cells) <= MAX_ENUMERATED_CELLS:
+        found = solutions(component, cells)
+    else:
+        found = sample_solutions(component, cells, SAMPLES, generator)
+
+    counts = dict()
+    for solution in found:
+        k = sum(solution)
+        if k not in counts:
+            counts[k] = [0, [0] * len(cells)]
+        counts[k][0] += 1
+        counts[k][1] = [c + v for c, v in zip(counts[k][1], solution)]
+    return counts
+
+
+def convolve(first, second):
+    """
+    Returns the number of ways to place each total number of mines,
+    given the ways for two independent groups of cells.
+    """
+    total = dict()
+    for i, a in first.items():
+        for j, b in second.items():
+            total[i + j] = total.get(i + j, 0) + a * b
+    return total
+
+
+def probabilities(sentences, unknown, mines=None, cache=None,
+                  generator=random):
+    """
+    Returns the probability that each unknown cell is a mine, given
+    (cells, count) sentences over those cells.
+
+    Every component's solutions are counted by their number of mines.
+    If mines, the number of mines left among the unknown cells, is
+    given, each combination of component solutions is weighted by the
+    ways to place the remaining mines on the unconstrained cells.
+    Otherwise components are independent, and unconstrained cells get
+    the average probability of the constrained ones.
+
+    If given, cache maps components to their distributions from earlier
+    calls, and is pruned to the current components like in solve.
+    """
+    groups = []
+    seen = set()
+    for component in components(sentences):
+        key = component_key(component)
+        seen.add(key)
+        if cache is not None and key in cache:
+            cells, counts = cache[key]
+        else:
+            cells = ordered_cells(component)
+            counts = distribution(component, cells, generator)
+            if cache is not None:
+                cache[key] = cells, counts
+        if counts:
+            groups.append((cells, counts))
+    if cache is not None:
+        for key in cache.keys() - seen:
+            del cache[key]
+
+    constrained = {cell for cells, _ in groups for cell in cells}
+    rest = [cell for cell in unknown if cell not in constrained]
+    result = dict()
+
+    # Ways to place the mines left on unconstrained cells, by frontier mines
+    def rest_ways(k):
+        left = mines - k
+        return math.comb(len(rest), left) if 0 <= left <= len(rest) else 0
+
+    ways = [{k: n for k, (n, _) in counts.items()} for _, counts in groups]
+    total = {0: 1}
+    for component_ways in ways:
+        total = convolve(total, component_ways)
+    weight = (sum(n * rest_ways(k) for k, n in total.items())
+              if mines is not None else 0)
+
+    if weight:
+        for index, (cells, counts) in enumerate(groups):
+            others = {0: 1}
+            for other, component_ways in enumerate(ways):
+                if other != index:
+                    others = convolve(others, component_ways)
+            mine_weight = [0] * len(cells)
+            for k, (_, cell_counts) in counts.items():
+                factor = sum(n * rest_ways(k + j) for j, n in others.items())
+                for i, count in enumerate(cell_counts):
+                    mine_weight[i] += count * factor
+            for cell, w in zip(cells, mine_weight):
+                result[cell] = w / weight
+        if rest:
+            rest_mines = sum(n * rest_ways(k) * (mines - k)
+                             for k, n in total.items())
+            for cell in rest:
+                result[cell] = rest_mines / (weight * len(rest))
+    else:
+        for cells, counts in groups:
+            solutions_count = sum(n for n, _ in counts.values())
+            for i, cell in enumerate(cells):
+                result[cell] = sum(
+                    cell_counts[i] for _, cell_counts in counts.values()
+                ) / solutions_count
+        average = (sum(result.values()) / len(result) if result else 0.5)
+        for cell in rest:
+            result[cell] = average
+
+    return {cell: result[cell] for cell in unknown}
+
+
+if __name__ == "__main__":
+
+    # Sampling one sentence with a mine in 30 cells should be near uniform
+    cells = [(0, j) for j in range(30)]
+    found = sample_solutions([(set(cells), 1)], cells, 30000,
+                             random.Random(0))
+    frequencies = [sum(column) / len(found) for column in zip(*found)]
+    print(f"mine frequency per cell: {min(frequencies):.4f} to "
+          f"{max(frequencies):.4f}, expected {1 / 30:.4f}")
+    assert all(abs(f - 1 / 30) < 0.01 for f in frequencies)
@@ -1,10 +1,17 @@
 import itertools
 import random
+from collections import defaultdict, deque
+
+import constraints
 
 
 class Minesweeper():
     """
     Minesweeper game representation
+
+    Mines are a flat bytearray with cell (i, j) at index i * width + j,
+    and the number of mines around every cell is computed once, when
+    the board is made.
     """
 
     def __init__(self, height=8, width=8, mines=8):
@@ -12,27 +19,43 @@ class Minesweeper():
         # Set initial width, height, and number of mines
         self.height = height
         self.width = width
-        self.mines = set()
 
-        # Initialize an empty field with no mines
-        self.board = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                row.append(False)
-            self.board.append(row)
-
-        # Add mines randomly
-        while len(self.mines) != mines:
-            i = random.randrange(height)
-            j = random.randrange(width)
-            if not self.board[i][j]:
-                self.mines.add((i, j))
-                self.board[i][j] = True
+        # Sample distinct cells for the mines
+        self.cells = bytearray(height * width)
+        self.mines = set()
+        for index in random.sample(range(height * width), mines):
+            self.cells[index] = 1
+            self.mines.add(divmod(index, width))
+
+        # Count mines around every cell with a 3x3 box sum, done as a
+        # sum along each row followed by a sum along each column
+        horizontal = []
+        for i in range(height):
+            row = [0, *self.cells[i * width:(i + 1) * width], 0]
+            horizontal.append([a + b + c
+                               for a, b, c in zip(row, row[1:], row[2:])])
+        padding = [0] * width
+        horizontal = [padding, *horizontal, padding]
+        self.counts = []
+        for above, middle, below in zip(horizontal, horizontal[1:],
+                                        horizontal[2:]):
+            self.counts.extend(a + b + c
+                               for a, b, c in zip(above, middle, below))
+        for index, mine in enumerate(self.cells):
+            self.counts[index] -= mine
 
         # At first, player has found no mines
         self.mines_found = set()
 
+    @property
+    def board(self):
+        """
+        Rows of booleans, True where there is a mine.
+        """
+        return [[bool(self.cells[i * self.width + j])
+                 for j in range(self.width)]
+                for i in range(self.height)]
+
     def print(self):
         """
         Prints a text-based representation
@@ -41,7 +64,7 @@ class Minesweeper():
         for i in range(self.height):
             print("--" * self.width + "-")
             for j in range(self.width):
-                if self.board[i][j]:
+                if self.cells[i * self.width + j]:
                     print("|X", end="")
                 else:
                     print("| ", end="")
@@ -50,7 +73,7 @@ class Minesweeper():
 
     def is_mine(self, cell):
         i, j = cell
-        return self.board[i][j]
+        return bool(self.cells[i * self.width + j])
 
     def nearby_mines(self, cell):
         """
@@ -58,24 +81,26 @@ class Minesweeper():
         within one row and column of a given cell,
         not including the cell itself.
         """
+        i, j = cell
+        return self.counts[i * self.width + j]
 
-        # Keep count of nearby mines
-        count = 0
-
-        # Loop over all cells within one row and column
-        for i in range(cell[0] - 1, cell[0] + 2):
-            for j in range(cell[1] - 1, cell[1] + 2):
-
-                # Ignore the cell itself
-                if (i, j) == cell:
-                    continue
-
-                # Update count if cell in bounds and is mine
-                if 0 <= i < self.height and 0 <= j < self.width:
-                    if self.board[i][j]:
-                        count += 1
-
-        return count
+    def reveal(self, cell):
+        """
+        Returns the nearby mine counts of a safe cell and of every cell
+        opened with it: revealing a cell with no nearby mines also
+        reveals all its neighbors, cascading through further zeros.
+        """
+        counts = {cell: self.nearby_mines(cell)}
+        frontier = [cell] if counts[cell] == 0 else []
+        while frontier:
+            row, col = frontier.pop()
+            for i in range(max(0, row - 1), min(self.height, row + 2)):
+                for j in range(max(0, col - 1), min(self.width, col + 2)):
+                    if (i, j) not in counts:
+                        counts[i, j] = self.counts[i * self.width + j]
+                        if counts[i, j] == 0:
+                            frontier.append((i, j))
+        return counts
 
     def won(self):
         """
@@ -83,29 +108,101 @@ class Minesweeper():
         """
         return self.mines_found == self.mines
 
+class CellIndex():
+    """
+    Numbers cells in the order they are first seen, so that sets of
+    cells can be stored as int bitmasks without knowing the board size.
+    """
+
+    def __init__(self):
+        self.bits = dict()
+        self.cells = []
+
+    def bit(self, cell):
+        """
+        Returns the bit number of a cell, numbering it if it is new.
+        """
+        bit = self.bits.get(cell)
+        if bit is None:
+            bit = self.bits[cell] = len(self.cells)
+            self.cells.append(cell)
+        return bit
+
+
+# Bit numbers of the cells in every sentence's mask
+CELLS = CellIndex()
+
+
 class Sentence():
     """
     Logical statement about a Minesweeper game
     A sentence consists of a set of board cells,
     and a count of the number of those cells which are mines.
+
+    Cells are stored as an int bitmask over the shared CELLS index, so
+    subset tests and differences are single integer operations, and
+    sentences compare by their cells on any board. Sentences hash by
+    value; marking a cell changes the mask and so the hash, so a
+    sentence must be taken out of any hashed collection before it is
+    marked.
     """
 
     def __init__(self, cells, count):
-        self.cells = set(cells)
+        self.cells = cells
         self.count = count
 
+    @classmethod
+    def from_mask(cls, mask, count):
+        """
+        Returns the sentence with cells given as a bitmask.
+        """
+        sentence = cls((), count)
+        sentence.mask = mask
+        return sentence
+
+    @property
+    def cells(self):
+        """
+        The sentence's cells as a frozenset of (i, j) tuples.
+        """
+        if self._cells is None:
+            cells = []
+            mask = self.mask
+            while mask:
+                low = mask & -mask
+                cells.append(CELLS.cells[low.bit_length() - 1])
+                mask ^= low
+            self._cells = frozenset(cells)
+        return self._cells
+
+    @cells.setter
+    def cells(self, cells):
+        self.mask = 0
+        for cell in cells:
+            self.mask |= 1 << CELLS.bit(cell)
+        self._cells = None
+
     def __eq__(self, other):
-        return self.cells == other.cells and self.count == other.count
+        return self.mask == other.mask and self.count == other.count
+
+    def __hash__(self):
+        return hash((self.mask, self.count))
 
     def __str__(self):
-        return f"{self.cells} = {self.count}"
+        return f"{set(self.cells)} = {self.count}"
+
+    def issubset(self, other):
+        """
+        Returns True if all of this sentence's cells are in other.
+        """
+        return not self.mask & ~other.mask
 
     def known_mines(self):
         """
         Returns the set of all cells in self.cells known to be mines.
         """
         mines = set()
-        if len(self.cells) == self.count and self.count != 0:
+        if self.mask.bit_count() == self.count and self.count != 0:
             mines = self.cells
 
         return mines
@@ -125,9 +222,11 @@ class Sentence():
         Updates internal knowledge representation given the fact that
         a cell is known to be a mine.
         """
-        if cell in self.cells:
-            self.cells.remove(cell)
+        bit = CELLS.bits.get(cell)
+        if bit is not None and self.mask >> bit & 1:
+            self.mask ^= 1 << bit
             self.count -= 1
+            self._cells = None
 
 
     def mark_safe(self, cell):
@@ -135,21 +234,27 @@ class Sentence():
         Updates internal knowledge representation given the fact that
         a cell is known to be safe.
         """
-        
-        if cell in self.cells:
-            self.cells.remove(cell)
+        bit = CELLS.bits.get(cell)
+        if bit is not None and self.mask >> bit & 1:
+            self.mask ^= 1 << bit
+            self._cells = None
 
 class MinesweeperAI():
     """
     Minesweeper game player
     """
 
-    def __init__(self, height=8, width=8):
+    def __init__(self, height=8, width=8, mines=None, informed=True):
 
         # Set initial height and width
         self.height = height
         self.width = width
 
+        # Total number of mines on the board, if known, and whether
+        # guesses pick the cell least likely to be a mine
+        self.total_mines = mines
+        self.informed = informed
+
         # Keep track of which cells have been clicked on
         self.moves_made = set()
 
@@ -157,8 +262,23 @@ class MinesweeperAI():
         self.mines = set()
         self.safes = set()
 
-        # List of sentences about the game known to be true
-        self.knowledge = []
+        # Set of sentences about the game known to be true, each
+        # distinct and nonempty
+        self.knowledge = set()
+
+        # Sentences containing each cell, and sentences that changed
+        # since they were last checked for known mines and safes
+        self.cell_sentences = defaultdict(set)
+        self.pending = deque()
+
+        # Cells of sentences added or changed since they were last
+        # solved jointly and paired for subset inference
+        self.touched = set()
+
+        # Solver results and mine distributions for each component
+        # of the knowledge base
+        self.solved = dict()
+        self.distributions = dict()
 
     def mark_mine(self, cell):
         """
@@ -166,8 +286,10 @@ class MinesweeperAI():
         to mark that cell as a mine as well.
         """
         self.mines.add(cell)
-        for sentence in self.knowledge:
+        for sentence in self.cell_sentences.pop(cell, ()):
+            self.remove_sentence(sentence)
             sentence.mark_mine(cell)
+            self.add_sentence(sentence)
 
     def mark_safe(self, cell):
         """
@@ -175,8 +297,68 @@ class MinesweeperAI():
         to mark that cell as safe as well.
         """
         self.safes.add(cell)
-        for sentence in self.knowledge:
+        for sentence in self.cell_sentences.pop(cell, ()):
+            self.remove_sentence(sentence)
             sentence.mark_safe(cell)
+            self.add_sentence(sentence)
+
+    def add_sentence(self, sentence):
+        """
+        Adds a sentence to the knowledge base and the cell index, and
+        queues it to be checked for known mines and safes. Empty
+        sentences and sentences already known are dropped.
+        """
+        if not sentence.mask or sentence in self.knowledge:
+            return
+        self.knowledge.add(sentence)
+        for cell in sentence.cells:
+            self.cell_sentences[cell].add(sentence)
+        self.pending.append(sentence)
+        self.touched |= sentence.cells
+
+    def remove_sentence(self, sentence):
+        """
+        Removes a sentence from the knowledge base and the cell index.
+        """
+        self.knowledge.discard(sentence)
+        for cell in sentence.cells:
+            sentences = self.cell_sentences.get(cell)
+            if sentences is not None:
+                sentences.discard(sentence)
+                if not sentences:
+                    del self.cell_sentences[cell]
+
+    def connected(self, cells):
+        """
+        Returns the sentences containing the given cells, and every
+        sentence linked to those through shared cells.
+        """
+        sentences = set()
+        seen = set(cells)
+        frontier = list(seen)
+        while frontier:
+            for sentence in self.cell_sentences.get(frontier.pop(), ()):
+                if sentence not in sentences:
+                    sentences.add(sentence)
+                    for cell in sentence.cells - seen:
+                        seen.add(cell)
+                        frontier.append(cell)
+        return sentences
+
+    def propagate(self):
+        """
+        Marks the known mines and safes of every pending sentence. Marking
+        a cell queues only the sentences containing it, so work follows
+        the changes rather than the size of the knowledge base.
+        """
+        while self.pending:
+            sentence = self.pending.popleft()
+            if sentence not in self.knowledge:
+                continue
+            for mine in list(sentence.known_mines()):
+                self.mark_mine(mine)
+            for safe in list(sentence.known_safes()):
+                self.mark_safe(safe)
 
     def add_knowledge(self, cell, count):
         """
@@ -193,68 +375,86 @@ class MinesweeperAI():
             5) add any new sentences to the AI's knowledge base
                if they can be inferred from existing knowledge
         """
-        
-        # 1) Mark the cell as a move made
-        self.moves_made.add(cell)
-
-        # 2) Mark the cell as safe
-        self.mark_safe(cell)
-
-        # 3) Add a new sentence to the knowledge base
-        neighbors = set()
-        row, col = cell
-        for i in range(max(0, row - 1), min(self.height, row + 2)):
-            for j in range(max(0, col - 1), min(self.width, col + 2)):
-                neighbor = (i, j)
-                if neighbor != cell and neighbor not in self.moves_made:
-                    if neighbor not in self.mines and neighbor not in self.safes:
-                        neighbors.add(neighbor)
-                    elif neighbor in self.mines:
-                        count -= 1  # Decrement count for known mines
-
-        if neighbors:
-            new_sentence = Sentence(neighbors, count)
-            self.knowledge.append(new_sentence)
+        self.add_knowledge_batch([(cell, count)])
+
+    def add_knowledge_batch(self, observations):
+        """
+        Adds the knowledge of many revealed cells at once, given as
+        (cell, count) pairs such as Minesweeper.reveal(cell).items().
+        All their sentences are added before a single inference pass,
+        so a cascade of reveals costs one round of inference.
+        """
+        observations = list(observations)
+
+        # 1) Mark the cells as moves made, and 2) mark them as safe
+        for cell, _ in observations:
+            self.moves_made.add(cell)
+            self.mark_safe(cell)
+
+        # 3) Add a new sentence to the knowledge base for each cell
+        for cell, count in observations:
+            neighbors = set()
+            row, col = cell
+            for i in range(max(0, row - 1), min(self.height, row + 2)):
+                for j in range(max(0, col - 1), min(self.width, col + 2)):
+                    neighbor = (i, j)
+                    if neighbor != cell and neighbor not in self.moves_made:
+                        if neighbor not in self.mines and neighbor not in self.safes:
+                            neighbors.add(neighbor)
+                        elif neighbor in self.mines:
+                            count -= 1  # Decrement count for known mines
+
+            if neighbors:
+                self.add_sentence(Sentence(neighbors, count))
 
         # 4) Mark any additional cells as safe or as mines
+        touched = set()
         while True:
-            updated = False
-
-            for sentence in self.knowledge.copy():
-                known_mines = sentence.known_mines()
-                known_safes = sentence.known_safes()
-
-                if known_mines:
-                    updated = True
-                    for mine in known_mines.copy():
-                        self.mark_mine(mine)
-
-                if known_safes:
-                    updated = True
-                    for safe in known_safes.copy():
-                        self.mark_safe(safe)
-
-                # Clean up sentences that are now empty or trivially true
-                if not sentence.cells:
-                    self.knowledge.remove(sentence)
+            self.propagate()
+
+            # Once no single sentence tells more, solve the components
+            # that changed since they were last solved jointly
+            touched |= self.touched
+            changed = self.connected(self.touched)
+            self.touched = set()
+            mines, safes = constraints.solve([
+                (sentence.cells, sentence.count) for sentence in changed
+            ], self.solved)
+            for mine in mines:
+                self.mark_mine(mine)
+            for safe in safes:
+                self.mark_safe(safe)
 
             # Stop if no new updates were made
-            if not updated:
+            if not mines and not safes:
                 break
 
-        # 5) Infer new sentences
-        inferred_sentences = []
-        for sentence1 in self.knowledge:
-            for sentence2 in self.knowledge:
-                if sentence1 != sentence2 and sentence1.cells.issubset(sentence2.cells):
-                    new_cells = sentence2.cells - sentence1.cells
-                    new_count = sentence2.count - sentence1.count
-                    inferred_sentence = Sentence(new_cells, new_count)
-                    if inferred_sentence not in self.knowledge and inferred_sentence not in inferred_sentences:
-                        inferred_sentences.append(inferred_sentence)
+        # 5) Infer new sentences, pairing each sentence on a touched
+        # cell with the sentences sharing a cell with it, since only
+        # they can contain it or be contained in it
+        inferred_sentences = set()
+        for sentence1 in {sentence for cell in touched
+                          for sentence in self.cell_sentences.get(cell, ())}:
+            for cell in sentence1.cells:
+                for sentence2 in self.cell_sentences[cell]:
+                    if sentence1 == sentence2:
+                        continue
+                    if sentence1.issubset(sentence2):
+                        smaller, larger = sentence1, sentence2
+                    elif sentence2.issubset(sentence1):
+                        smaller, larger = sentence2, sentence1
+                    else:
+                        continue
+                    new_cells = larger.mask & ~smaller.mask
+                    new_count = larger.count - smaller.count
+                    inferred_sentence = Sentence.from_mask(new_cells, new_count)
+                    if inferred_sentence not in self.knowledge:
+                        inferred_sentences.add(inferred_sentence)
 
         # Add inferred sentences to the knowledge base
-        self.knowledge.extend(inferred_sentences)
+        for sentence in inferred_sentences:
+            self.add_sentence(sentence)
+        self.propagate()
 
     def make_safe_move(self):
         """
@@ -275,104 +475,122 @@ class MinesweeperAI():
     def make_random_move(self):
         """
         Returns a move to make on the Minesweeper board.
-        Should choose randomly among cells that:
+        Should choose among cells that:
             1) have not already been chosen, and
             2) are not known to be mines
+        In informed mode, the choice is random among the cells least
+        likely to be a mine; otherwise it is uniformly random.
         """
-
-        if len(self.moves_made) == self.height * self.width:
+        candidates = [(i, j) for i in range(self.height)
+                      for j in range(self.width)
+                      if (i, j) not in self.moves_made
+                      and (i, j) not in self.mines]
+        if not candidates:
             return None
-        
-        random_height = random.randint(0, self.height - 1)
-        random_width = random.randint(0, self.width - 1)
-
-        while (random_height, random_width) in self.moves_made or (random_height, random_width) in self.mines:
-            random_height = random.randint(0, self.height - 1)
-            random_width = random.randint(0, self.width - 1)
-
-        return (random_height, random_width)
-    
-
-
-# board = Minesweeper(4, 4, 15)
-# print(board.print())
-# # ai = MinesweeperAI(4, 4)
-# # print(ai.make_safe_move())
-# s = Sentence({(1, 1), (1, 2), (2, 1), (2, 2)}, 4)
-# print(s.known_mines())
-
-def print_ai_status(ai):
-    print(f'\nAfter move:{move} with nearby_count:{nearby_count}')
-    if ai.knowledge:
-        print('Sentences in Knowledge Base:')
-        for cnt, s in enumerate(ai.knowledge):
-            print(f'{cnt}: {s}')
-    else:
-        print('NO Sentences in Knowledge Base.')       
-    # print(f'Safe Cells: {sorted(list(ai.safes))}')
-    # print(f'Mine Cells: {sorted(list(ai.mines))}')    
-    print(f'Safe Cells: {ai.safes}')
-    print(f'Mine Cells: {ai.mines}')    
-
-    
-# Create AI agent
-HEIGHT, WIDTH, MINES = 8, 8, 8
-ai = MinesweeperAI(height=HEIGHT, width=WIDTH)
-
-# Test new sentence logic (3rd requirement)
-move, nearby_count = (1,1), 0
-ai.add_knowledge(move,nearby_count)
-print_ai_status(ai)
-
-move, nearby_count = (2,2), 2
-ai.add_knowledge(move,nearby_count)
-print_ai_status(ai)
-
-# Test inference logic for new safes or mines (4th requirement)
-move, nearby_count = (3,3), 0
-ai.add_knowledge(move,nearby_count)
-print_ai_status(ai)
-
-
-
-
-# Expected output:
-# After move:(1, 1) with nearby_count:0
-# NO Sentences in Knowledge Base.
-# Safe Cells: [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (2, 0), (2, 1), (2, 2)]
-# Mine Cells: []
-
-# After move:(2, 2) with nearby_count:2
-# Sentences in Knowledge Base:
-# 0: {(3, 2), (1, 3), (2, 3), (3, 3), (3, 1)} = 2
-# Safe Cells: [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (2, 0), (2, 1), (2, 2)]
-# Mine Cells: []
-
-# After move:(3, 3) with nearby_count:0
-# NO Sentences in Knowledge Base.
-# Safe Cells: [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (2, 0), (2, 1), (2, 2), (2, 3), (2, 4), (3, 2), (3, 3), (3, 4), (4, 2), (4, 3), (4, 4)]
-# Mine Cells: [(1, 3), (3, 1)]
-
-
-
-# Setup for new sentence inference logic test
-move, nearby_count = (4,2), 1
-ai.add_knowledge(move,nearby_count)
-print_ai_status(ai)
-
-# Tests subset inference logic for new sentences (5th requirement)
-move, nearby_count = (7,2), 2
-ai.add_knowledge(move,nearby_count)
-print_ai_status(ai)
-
-move, nearby_count = (5,2), 1
-ai.add_knowledge(move,nearby_count)
-print_ai_status(ai)
-
-# Here is the output after the last move:
-# After move:(5, 2) with nearby_count:1
-# Sentences in Knowledge Base:
-# 0: {(7, 3), (7, 1)} = 1
-# 1: {(6, 3), (6, 1), (6, 2)} = 1
-# Safe Cells: [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (2, 0), (2, 1), (2, 2), (2, 3), (2, 4), (3, 2), (3, 3), (3, 4), (4, 1), (4, 2), (4, 3), (4, 4), (5, 1), (5, 2), (5, 3), (7, 2)]
-# Mine Cells: [(1, 3), (3, 1)]
+        if not self.informed:
+            return random.choice(candidates)
+
+        probabilities = self.mine_probabilities(candidates)
+        lowest = min(probabilities.values())
+        return random.choice([cell for cell in candidates
+                              if probabilities[cell] <= lowest + 1e-12])
+
+    def mine_probabilities(self, cells):
+        """
+        Returns the probability that each of the given unknown cells is
+        a mine, given the knowledge base and the number of mines left.
+        """
+        mines_left = None
+        if self.total_mines is not None:
+            mines_left = self.total_mines - len(self.mines)
+        return constraints.probabilities(
+            [(sentence.cells, sentence.count) for sentence in self.knowledge],
+            cells, mines_left, self.distributions
+        )
+
+
+
+if __name__ == "__main__":
+
+    # board = Minesweeper(4, 4, 15)
+    # print(board.print())
+    # # ai = MinesweeperAI(4, 4)
+    # # print(ai.make_safe_move())
+    # s = Sentence({(1, 1), (1, 2), (2, 1), (2, 2)}, 4)
+    # print(s.known_mines())
+
+    def print_ai_status(ai):
+        print(f'\nAfter move:{move} with nearby_count:{nearby_count}')
+        if ai.knowledge:
+            print('Sentences in Knowledge Base:')
+            for cnt, s in enumerate(ai.knowledge):
+                print(f'{cnt}: {s}')
+        else:
+            print('NO Sentences in Knowledge Base.')       
+        # print(f'Safe Cells: {sorted(list(ai.safes))}')
+        # print(f'Mine Cells: {sorted(list(ai.mines))}')    
+        print(f'Safe Cells: {ai.safes}')
+        print(f'Mine Cells: {ai.mines}')    
+
+
+    # Create AI agent
+    HEIGHT, WIDTH, MINES = 8, 8, 8
+    ai = MinesweeperAI(height=HEIGHT, width=WIDTH)
+
+    # Test new sentence logic (3rd requirement)
+    move, nearby_count = (1,1), 0
+    ai.add_knowledge(move,nearby_count)
+    print_ai_status(ai)
+
+    move, nearby_count = (2,2), 2
+    ai.add_knowledge(move,nearby_count)
+    print_ai_status(ai)
+
+    # Test inference logic for new safes or mines (4th requirement)
+    move, nearby_count = (3,3), 0
+    ai.add_knowledge(move,nearby_count)
+    print_ai_status(ai)
+
+
+
+
+    # Expected output:
+    # After move:(1, 1) with nearby_count:0
+    # NO Sentences in Knowledge Base.
+    # Safe Cells: [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (2, 0), (2, 1), (2, 2)]
+    # Mine Cells: []
+
+    # After move:(2, 2) with nearby_count:2
+    # Sentences in Knowledge Base:
+    # 0: {(3, 2), (1, 3), (2, 3), (3, 3), (3, 1)} = 2
+    # Safe Cells: [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (2, 0), (2, 1), (2, 2)]
+    # Mine Cells: []
+
+    # After move:(3, 3) with nearby_count:0
+    # NO Sentences in Knowledge Base.
+    # Safe Cells: [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (2, 0), (2, 1), (2, 2), (2, 3), (2, 4), (3, 2), (3, 3), (3, 4), (4, 2), (4, 3), (4, 4)]
+    # Mine Cells: [(1, 3), (3, 1)]
+
+
+
+    # Setup for new sentence inference logic test
+    move, nearby_count = (4,2), 1
+    ai.add_knowledge(move,nearby_count)
+    print_ai_status(ai)
+
+    # Tests subset inference logic for new sentences (5th requirement)
+    move, nearby_count = (7,2), 2
+    ai.add_knowledge(move,nearby_count)
+    print_ai_status(ai)
+
+    move, nearby_count = (5,2), 1
+    ai.add_knowledge(move,nearby_count)
+    print_ai_status(ai)
+
+    # Here is the output after the last move:
+    # After move:(5, 2) with nearby_count:1
+    # Sentences in Knowledge Base:
+    # 0: {(7, 3), (7, 1)} = 1
+    # 1: {(6, 3), (6, 1), (6, 2)} = 1
+    # Safe Cells: [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (2, 0), (2, 1), (2, 2), (2, 3), (2, 4), (3, 2), (3, 3), (3, 4), (4, 1), (4, 2), (4, 3), (4, 4), (5, 1), (5, 2), (5, 3), (7, 2)]
+    # Mine Cells: [(1, 3), (3, 1)]
@@ -0,0 +1,139 @@
+"""
+Plays seeded Minesweeper games with MinesweeperAI without the pygame UI,
+and reports the AI's win rate, guesses per game and add_knowledge
+latency.
+
+Usage: python simulate.py [--games 1000] [--height 16] [--width 16]
+                          [--mines 40] [--uniform] [--cascade]
+                          [--output report.json]
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from minesweeper import Minesweeper, MinesweeperAI
+
+
+def play(height, width, mines, informed, cascade, seed):
+    """
+    Plays one game. Returns whether the AI won, how many moves it had to
+    guess, and the latency of every add_knowledge call in seconds.
+
+    With cascade, a move also reveals the cells its zero count opens,
+    as in a real game, and they are added in one add_knowledge_batch.
+    """
+    random.seed(seed)
+    game = Minesweeper(height=height, width=width, mines=mines)
+    ai = MinesweeperAI(height=height, width=width, mines=mines,
+                       informed=informed)
+    guesses = 0
+    latencies = []
+
+    while len(ai.moves_made) < height * width - mines:
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_random_move()
+            guesses += 1
+        if game.is_mine(move):
+            return False, guesses, latencies
+
+        start = time.perf_counter()
+        if cascade:
+            ai.add_knowledge_batch(
+                (cell, count) for cell, count in game.reveal(move).items()
+                if cell not in ai.moves_made
+            )
+        else:
+            ai.add_knowledge(move, game.nearby_mines(move))
+        latencies.append(time.perf_counter() - start)
+    return True, guesses, latencies
+
+
+def percentile(values, q):
+    """
+    Returns the q-th percentile of sorted values, by nearest rank.
+    """
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def run(games, height, width, mines, informed, cascade, processes, seed):
+    start = time.perf_counter()
+    seeds = [seed + game for game in range(games)]
+    arguments = [[height] * games, [width] * games, [mines] * games,
+                 [informed] * games, [cascade] * games, seeds]
+    if processes == 1:
+        results = list(map(play, *arguments))
+    else:
+        with ProcessPoolExecutor(processes) as executor:
+            results = list(executor.map(
+                play, *arguments,
+                chunksize=max(1, games // (4 * processes))
+            ))
+    seconds = time.perf_counter() - start
+
+    latencies = sorted(latency for _, _, calls in results
+                       for latency in calls)
+    mean = sum(latencies) / len(latencies) if latencies else 0.0
+    return {
+        "games": games,
+        "height": height,
+        "width": width,
+        "mines": mines,
+        "informed": informed,
+        "cascade": cascade,
+        "processes": processes,
+        "seconds": seconds,
+        "win_rate": sum(won for won, _, _ in results) / games,
+        "guesses_per_game": sum(guesses for _, guesses, _ in results) / games,
+        "add_knowledge_calls": len(latencies),
+        "add_knowledge_ms": {
+            "mean": mean * 1000,
+            **{f"p{q}": percentile(latencies, q) * 1000
+               for q in (50, 90, 99)},
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--height", type=int, default=8)
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--mines", type=int, default=8)
+    parser.add_argument("--uniform", action="store_true",
+                        help="guess uniformly at random")
+    parser.add_argument("--cascade", action="store_true",
+                        help="open zero cells' neighbors, adding them in "
+                             "one batch")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args.games, args.height, args.width, args.mines,
+                 not args.uniform, args.cascade, args.processes, args.seed)
+
+    latency = report["add_knowledge_ms"]
+    print(f"{report['games']} games of {args.height}x{args.width} with "
+          f"{args.mines} mines in {report['seconds']:.2f}s: "
+          f"win rate {report['win_rate']:.1%}, "
+          f"{report['guesses_per_game']:.2f} guesses/game", file=sys.stderr)
+    print(f"add_knowledge: mean {latency['mean']:.3f}ms "
+          f"p50 {latency['p50']:.3f}ms p90 {latency['p90']:.3f}ms "
+          f"p99 {latency['p99']:.3f}ms", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()